@@ -4,106 +4,78 @@ Simple Decompiler for 64KiB CPU
 Converts machine code (list of integers) back to assembly source code
 """
 
-from typing import List, Dict, Tuple, Optional
+import ast
+import os
+import sys
+from itertools import islice
+from typing import List, Dict, Tuple, Optional, Union, Iterator
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from python_cpu_emulator.compiler import PARAM_WIDTHS
+from python_cpu_emulator.instructions import InstructionSet
+
+# Instructions whose 2-byte parameter is a code address worth labelling
+JUMP_INSTRUCTIONS = ("JMP", "JNZ", "JMZ", "JNN", "JMN", "JNO", "JMO", "JAD", "WPC", "RPC",
+                     "IJX", "IZA", "IJA", "IJY")
+
+# Machine code is accepted as a list of byte values or any bytes-like object
+MachineCode = Union[List[int], bytes, bytearray, memoryview]
+
+
+def as_bytes(machine_code: MachineCode) -> Union[bytes, bytearray, memoryview]:
+    """Machine code as a bytes-like object, a list holding anything but byte values raises a ValueError"""
+    if isinstance(machine_code, (bytes, bytearray, memoryview)):
+        return machine_code
+    try:
+        return bytes(machine_code)
+    except (TypeError, ValueError):
+        for i, value in enumerate(machine_code):
+            if not isinstance(value, int) or not (0 <= value <= 255):
+                raise ValueError(f"Invalid byte value at position {i}: {value} (must be 0-255)") from None
+        raise
 
 
 class CPUDecompiler:
     """Decompiler for the 8-bit CPU instruction set"""
     
     def __init__(self):
-        # Instruction set mapping: opcode -> (name, length, description)
+        # Instruction set mapping: opcode -> (name, length, description), taken from the emulator itself
+        # so new instructions decompile without being listed here as well
         self.instructions = {
-            0: ("HLT", 0, "Halt - stops the processor"),
-            1: ("CLR", 0, "Clear - resets A, X and Y registers to 0"),
-            2: ("NOP", 0, "No Operation - does nothing but increase the tick counter"),
-            3: ("AAX", 0, "Add A and X - Adds register A to register X and store the value in register A"),
-            4: ("AAY", 0, "Add A and Y - Adds register A to register Y and store the value in register A"),
-            5: ("AXY", 0, "Add X and Y - Adds register X to register Y and store the value in register X"),
-            6: ("SAX", 0, "Subtract A and X - Subtracts register X from register A and store the value in register A"),
-            7: ("SAY", 0, "Subtract A and Y - Subtracts register Y from register A and store the value in register A"),
-            8: ("SXY", 0, "Subtract X and Y - Subtracts register Y from register X and store the value in register X"),
-            9: ("INA", 0, "Increment A - Adds 1 to value of A register"),
-            10: ("INX", 0, "Increment X - Adds 1 to value of X register"),
-            11: ("INY", 0, "Increment Y - Adds 1 to value of Y register"),
-            12: ("DEA", 0, "Decrement A - Subtracts 1 from value of A register"),
-            13: ("DEX", 0, "Decrement X - Subtracts 1 from value of X register"),
-            14: ("DEY", 0, "Decrement Y - Subtracts 1 from value of Y register"),
-            15: ("NAX", 0, "AND A & X - ANDs A and X and saves the result in A"),
-            16: ("NAY", 0, "AND A & Y - ANDs A and Y and saves the result in A"),
-            17: ("NXY", 0, "AND X & Y - ANDs X and Y and saves the result in X"),
-            18: ("OAX", 0, "OR A & X - ORs A and X and saves the result in A"),
-            19: ("OAY", 0, "OR A & Y - ORs A and Y and saves the result in A"),
-            20: ("OXY", 0, "OR X & Y - ORs X and Y and saves the result in X"),
-            21: ("XAX", 0, "XOR A and X - XORs A and X and saves the result in A"),
-            22: ("XAY", 0, "XOR A and Y - XORs A and Y and saves the result in A"),
-            23: ("XXY", 0, "XOR X and Y - XORs X and Y and saves the result in X"),
-            24: ("BLA", 0, "Bit Shift Left A - Bit-shift A register left by 1 (double)"),
-            25: ("BLX", 0, "Bit Shift Left X - Bit-shift X register left by 1 (double)"),
-            26: ("BLY", 0, "Bit Shift Left Y - Bit-shift Y register left by 1 (double)"),
-            27: ("BRA", 0, "Bit Shift Right A - Bit-shift A register right by 1 (half)"),
-            28: ("BRX", 0, "Bit Shift Right X - Bit-shift X register right by 1 (half)"),
-            29: ("BRY", 0, "Bit Shift Right Y - Bit-shift Y register right by 1 (half)"),
-            30: ("EAX", 0, "Equal A and X - Compares A and X for equality and sets Zero flag if true"),
-            31: ("EAY", 0, "Equal A and Y - Compares A and Y for equality and sets Zero flag if true"),
-            32: ("EXY", 0, "Equal X and Y - Compares X and Y for equality and sets Zero flag if true"),
-            33: ("JMP", 2, "Jump - Jump to specified memory location"),
-            34: ("JNZ", 2, "Jump Not Zero - Jump to specified memory location if the Zero flag was not set"),
-            35: ("JMZ", 2, "Jump if Zero - Jump to specified memory location if the Zero flag was set"),
-            36: ("JNN", 2, "Jump Not Negative - Jump to specified memory location if the Negative flag was not set"),
-            37: ("JMN", 2, "Jump if Negative - Jump to specified memory location if the Negative flag was set"),
-            38: ("JNO", 2, "Jump Not Overflow - Jump to specified memory location if the Overflow flag was not set"),
-            39: ("JMO", 2, "Jump if Overflow - Jump to specified memory location if the Overflow flag was set"),
-            40: ("JFA", 0, "Jump Forward A - sets PC to its current value plus the value of the A register"),
-            41: ("JFX", 0, "Jump Forward X - sets PC to its current value plus the value of the X register"),
-            42: ("JFY", 0, "Jump Forward Y - sets PC to its current value plus the value of the Y register"),
-            43: ("JBA", 0, "Jump Backward A - sets PC to its current value minus the value of the A register"),
-            44: ("JBX", 0, "Jump Backward X - sets PC to its current value minus the value of the X register"),
-            45: ("JBY", 0, "Jump Backward Y - sets PC to its current value minus the value of the Y register"),
-            46: ("JAD", 2, "Jump to Memory Address - Sets program counter to address at specified memory location"),
-            47: ("WPC", 2, "Write Program Counter - writes the current value of the program counter to specified memory location"),
-            48: ("RPC", 2, "Read Program Counter - reads a 2-byte value from specified memory location and sets PC"),
-            49: ("LDA", 1, "Load A - loads A register with a specified value"),
-            50: ("LDX", 1, "Load X - loads X register with a specified value"),
-            51: ("LDY", 1, "Load Y - loads Y register with a specified value"),
-            52: ("CAX", 0, "Copy A to X - Copies A register into X register"),
-            53: ("CAY", 0, "Copy A to Y - Copies A register into Y register"),
-            54: ("CXY", 0, "Copy X to Y - Copies X register into Y register"),
-            55: ("CYX", 0, "Copy Y to X - Copies Y register into X register"),
-            56: ("CXA", 0, "Copy X to A - Copies X register into A register"),
-            57: ("CYA", 0, "Copy Y to A - Copies Y register into A register"),
-            58: ("CAZ", 1, "Conditional Load A if Zero - Load A with immediate value if Zero flag is set"),
-            59: ("NAZ", 1, "Conditional Load A if Not Zero - Load A with immediate value if Zero flag is not set"),
-            60: ("CAO", 1, "Conditional Load A if Overflow - Load A with immediate value if Overflow flag is set"),
-            61: ("NAO", 1, "Conditional Load A if Not Overflow - Load A with immediate value if Overflow flag is not set"),
-            62: ("CAN", 1, "Conditional Load A if Negative - Load A with immediate value if Negative flag is set"),
-            63: ("NAN", 1, "Conditional Load A if Not Negative - Load A with immediate value if Negative flag is not set"),
-            64: ("CXZ", 1, "Conditional Load X if Zero - Load X with immediate value if Zero flag is set"),
-            65: ("NXZ", 1, "Conditional Load X if Not Zero - Load X with immediate value if Zero flag is not set"),
-            66: ("CXO", 1, "Conditional Load X if Overflow - Load X with immediate value if Overflow flag is set"),
-            67: ("NXO", 1, "Conditional Load X if Not Overflow - Load X with immediate value if Overflow flag is not set"),
-            68: ("CXN", 1, "Conditional Load X if Negative - Load X with immediate value if Negative flag is set"),
-            69: ("NXN", 1, "Conditional Load X if Not Negative - Load X with immediate value if Negative flag is not set"),
-            70: ("CYZ", 1, "Conditional Load Y if Zero - Load Y with immediate value if Zero flag is set"),
-            71: ("NYZ", 1, "Conditional Load Y if Not Zero - Load Y with immediate value if Zero flag is not set"),
-            72: ("CYO", 1, "Conditional Load Y if Overflow - Load Y with immediate value if Overflow flag is set"),
-            73: ("NYO", 1, "Conditional Load Y if Not Overflow - Load Y with immediate value if Overflow flag is not set"),
-            74: ("CYN", 1, "Conditional Load Y if Negative - Load Y with immediate value if Negative flag is set"),
-            75: ("NYN", 1, "Conditional Load Y if Not Negative - Load Y with immediate value if Negative flag is not set"),
-            76: ("WMA", 2, "Write Memory A - writes the value of register A to specified memory location"),
-            77: ("WMX", 2, "Write Memory X - writes the value of register X to specified memory location"),
-            78: ("WMY", 2, "Write Memory Y - writes the value of register Y to specified memory location"),
-            79: ("RMA", 2, "Read Memory A - reads the value of specified memory location to register A"),
-            80: ("RMX", 2, "Read Memory X - reads the value of specified memory location to register X"),
-            81: ("RMY", 2, "Read Memory Y - reads the value of specified memory location to register Y"),
-            82: ("RMI", 0, "Read Memory Indexed - reads memory[X + Y*256] into A register"),
-            83: ("WMI", 0, "Write Memory Indexed - writes A register to memory[X + Y*256]"),
-            84: ("RMO", 2, "Read Memory Offset - reads memory[base_addr + X] into A register"),
-            85: ("WMO", 2, "Write Memory Offset - writes A register to memory[base_addr + X]"),
-            86: ("FIL", 1, "Fill - Fill A bytes starting at (X,Y) with value from parameter"),
-            87: ("CMP", 2, "Compare Memory - Compare A bytes at (X,Y) with bytes at specified address"),
-            88: ("CPY", 2, "Copy Memory - Copy A bytes from source (X,Y) to destination address"),
+            opcode: (cls.__name__, cls.length, " ".join(cls.__doc__.split()))
+            for opcode, cls in sorted(InstructionSet.items())
         }
         
+        # Flat per-opcode tables indexed straight by the opcode byte, None/0 for unknown opcodes
+        self._name: List[Optional[str]] = [None] * 256
+        self._desc: List[Optional[str]] = [None] * 256
+        # Operand widths of instructions taking more than one operand (superinstructions), None otherwise
+        self._widths: List[Optional[Tuple[int, ...]]] = [None] * 256
+        lengths = bytearray(256)
+        is_jump = bytearray(256)
+        for opcode, (name, length, description) in self.instructions.items():
+            self._name[opcode] = name
+            self._desc[opcode] = description
+            lengths[opcode] = length
+            is_jump[opcode] = name in JUMP_INSTRUCTIONS
+            if len(PARAM_WIDTHS[name]) > 1:
+                self._widths[opcode] = PARAM_WIDTHS[name]
+        self._len = bytes(lengths)
+        self._is_jump = bytes(is_jump)
+        
+        # Instructions without parameters always decompile to the same text, with and without comments
+        self._line0_with_comments: List[Optional[str]] = [None] * 256
+        self._line0_bare: List[Optional[str]] = [None] * 256
+        for opcode, (name, length, description) in self.instructions.items():
+            if length == 0:
+                self._line0_with_comments[opcode] = f"{name:<20}    ; {description}"
+                self._line0_bare[opcode] = f"{name:<20}"
+        
+        # Every possible immediate value formatted once, printable ASCII gets its character as a comment
+        self._imm_str: List[str] = [self.format_immediate(value) for value in range(256)]
+        
         # Common memory addresses for better readability
         self.memory_labels = {
             0xEE00: "SP_LOW",
@@ -135,42 +107,47 @@ class CPUDecompiler:
             return f"{value}    ; '{chr(value)}'"
         return str(value)
     
-    def find_jump_targets(self, machine_code: List[int]) -> Dict[int, str]:
+    def read_operands(self, machine_code: MachineCode, offset: int, widths: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Read one operand per width starting at offset, 2-byte operands are big-endian addresses"""
+        operands = []
+        for width in widths:
+            if width == 2:
+                operands.append((machine_code[offset] << 8) | machine_code[offset + 1])
+            else:
+                operands.append(machine_code[offset])
+            offset += width
+        return tuple(operands)
+    
+    def find_jump_targets(self, machine_code: MachineCode) -> Dict[int, str]:
         """Find all jump targets to create labels"""
-        targets = {}
+        machine_code = as_bytes(machine_code)
+        target_numbers: Dict[int, int] = {}
         pc = 0
-        label_counter = 1
+        size = len(machine_code)
         
-        while pc < len(machine_code):
-            if pc >= len(machine_code):
-                break
-                
+        while pc < size:
+            # Unknown opcodes have length 0 and are never jumps, so they need no check of their own
             opcode = machine_code[pc]
-            if opcode not in self.instructions:
-                pc += 1
-                continue
-                
-            name, length, _ = self.instructions[opcode]
+            length = self._len[opcode]
             
             # Check if this is a jump instruction
-            if name in ["JMP", "JNZ", "JMZ", "JNN", "JMN", "JNO", "JMO", "JAD", "WPC", "RPC"]:
-                if pc + 2 < len(machine_code):
-                    target = self.bytes_to_address(machine_code[pc + 1], machine_code[pc + 2])
-                    if target not in targets and target < len(machine_code):
-                        targets[target] = f"LABEL_{label_counter}"
-                        label_counter += 1
+            if self._is_jump[opcode]:
+                if pc + 2 < size:
+                    target = (machine_code[pc + 1] << 8) | machine_code[pc + 2]
+                    if target < size:
+                        target_numbers.setdefault(target, len(target_numbers) + 1)
             
             pc += 1 + length
         
-        return targets
+        return {address: f"LABEL_{number}" for address, number in target_numbers.items()}
     
-    def decompile(self, machine_code: List[int], include_comments: bool = True, 
+    def decompile(self, machine_code: MachineCode, include_comments: bool = True, 
                   include_addresses: bool = False) -> str:
         """
         Decompile machine code to assembly source
         
         Args:
-            machine_code: List of integers representing machine code
+            machine_code: List of integers or bytes-like object representing machine code
             include_comments: Include instruction descriptions as comments
             include_addresses: Include memory addresses in output
             
@@ -180,83 +157,124 @@ class CPUDecompiler:
         if not machine_code:
             return "; Empty program\n"
         
-        # Find jump targets for labels
-        jump_targets = self.find_jump_targets(machine_code)
+        return "\n".join(self.iter_lines(machine_code, include_comments, include_addresses))
+    
+    def iter_lines(self, machine_code: MachineCode, include_comments: bool = True,
+                   include_addresses: bool = False) -> Iterator[str]:
+        """
+        Decompile machine code to assembly source one line at a time, takes the same arguments as decompile
+        """
+        if not machine_code:
+            yield "; Empty program"
+            return
         
-        lines = []
+        # Bytes index straight to small ints, far cheaper to walk than a list of Python ints
+        machine_code = as_bytes(machine_code)
+        
+        # Decode every instruction in one pass, collecting jump targets as they are found. A jump
+        # can reference a later address, so lines are only formatted once all labels are known
+        target_numbers: Dict[int, int] = {}
+        decoded = []
         pc = 0
+        size = len(machine_code)
+        
+        # Hoist the tables into locals, the loops below read them for every instruction
+        names, lengths, is_jump, descriptions = self._name, self._len, self._is_jump, self._desc
+        operand_widths = self._widths
+        immediates = self._imm_str
+        memory_labels = self.memory_labels
+        # Known labels sit in a narrow window, addresses outside it skip the dict lookup entirely
+        label_low, label_high = (min(memory_labels), max(memory_labels)) if memory_labels else (1, 0)
+        # Programs keep referencing the same few addresses, so each one is formatted only once
+        address_strings: Dict[int, str] = {}
+        
+        while pc < size:
+            opcode = machine_code[pc]
+            length = lengths[opcode]
+            param = None
+            
+            # Parameters are only decoded when all of their bytes are present
+            if length and pc + length < size:
+                if operand_widths[opcode] is not None:
+                    param = self.read_operands(machine_code, pc + 1, operand_widths[opcode])
+                elif length == 1:
+                    param = machine_code[pc + 1]
+                else:
+                    param = (machine_code[pc + 1] << 8) | machine_code[pc + 2]
+                    if is_jump[opcode] and param < size:
+                        target_numbers.setdefault(param, len(target_numbers) + 1)
+            
+            decoded.append((pc, opcode, param))
+            pc += 1 + length
+        
+        # Labels are numbered in order of first reference and only named once decoding is done
+        jump_targets = {address: f"LABEL_{number}" for address, number in target_numbers.items()}
+        
+        # The comment column depends only on the opcode, so build it once per opcode up front
+        comments = [f"    ; {description}" for description in descriptions] if include_comments else [""] * 256
+        fixed_lines = self._line0_with_comments if include_comments else self._line0_bare
         
         # Add header comment
-        lines.append("; Decompiled assembly code")
-        lines.append(f"; Original size: {len(machine_code)} bytes")
-        lines.append("")
+        yield "; Decompiled assembly code"
+        yield f"; Original size: {size} bytes"
+        yield ""
         
-        while pc < len(machine_code):
+        for address, opcode, param in decoded:
             # Add label if this address is a jump target
-            if pc in jump_targets:
-                lines.append(f":{jump_targets[pc]}")
+            if address in jump_targets:
+                yield f":{jump_targets[address]}"
             
-            # Check if we have enough bytes for an instruction
-            if pc >= len(machine_code):
-                break
-                
-            opcode = machine_code[pc]
+            name = names[opcode]
+            addr_str = f"[${address:04X}] " if include_addresses else ""
             
             # Handle unknown opcodes
-            if opcode not in self.instructions:
-                addr_str = f"[${pc:04X}] " if include_addresses else ""
-                lines.append(f"{addr_str}    ; Unknown opcode: {opcode}")
-                pc += 1
+            if name is None:
+                yield f"{addr_str}    ; Unknown opcode: {opcode}"
                 continue
             
-            name, length, description = self.instructions[opcode]
-            
-            # Build instruction line
-            addr_str = f"[${pc:04X}] " if include_addresses else ""
-            instruction_parts = [name]
+            length = lengths[opcode]
+            if length == 0:
+                yield addr_str + fixed_lines[opcode]
+                continue
             
-            # Add parameters based on instruction length
-            if length == 1:
-                if pc + 1 < len(machine_code):
-                    param = machine_code[pc + 1]
-                    instruction_parts.append(self.format_immediate(param))
+            # Format the parameter based on instruction length
+            if operand_widths[opcode] is not None:
+                if param is not None:
+                    operand = " ".join(self.format_address(value) if width == 2 else str(value)
+                                       for value, width in zip(param, operand_widths[opcode]))
                 else:
-                    instruction_parts.append("?? ; Missing parameter")
-                    
-            elif length == 2:
-                if pc + 2 < len(machine_code):
-                    high_byte = machine_code[pc + 1]
-                    low_byte = machine_code[pc + 2]
-                    address = self.bytes_to_address(high_byte, low_byte)
+                    operand = "?? ; Missing parameters"
                     
-                    # Use label if this address is a known jump target
-                    if address in jump_targets:
-                        instruction_parts.append(jump_targets[address])
-                    else:
-                        instruction_parts.append(self.format_address(address))
+            elif length == 1:
+                if param is not None:
+                    operand = immediates[param]
                 else:
-                    instruction_parts.append("?? ; Missing address")
+                    operand = "?? ; Missing parameter"
+                    
+            elif param is not None:
+                # Use label if this address is a known jump target
+                operand = jump_targets.get(param) or address_strings.get(param)
+                if operand is None:
+                    # Inlined format_address()
+                    label = memory_labels.get(param) if label_low <= param <= label_high else None
+                    operand = address_strings[param] = label or f"${param:04X}"
+            else:
+                operand = "?? ; Missing address"
             
             # Format the complete line
-            instruction_str = " ".join(instruction_parts)
-            comment_str = f"    ; {description}" if include_comments else ""
-            line = f"{addr_str}{instruction_str:<20}{comment_str}"
-            lines.append(line)
-            
-            pc += 1 + length
+            instruction_str = name + " " + operand
+            yield f"{addr_str}{instruction_str:<20}{comments[opcode]}"
         
         # Add any remaining bytes as data
-        if pc < len(machine_code):
-            lines.append("")
-            lines.append("; Remaining data:")
-            while pc < len(machine_code):
+        if pc < size:
+            yield ""
+            yield "; Remaining data:"
+            while pc < size:
                 addr_str = f"[${pc:04X}] " if include_addresses else ""
-                lines.append(f"{addr_str}    ; Data: {machine_code[pc]}")
+                yield f"{addr_str}    ; Data: {machine_code[pc]}"
                 pc += 1
-        
-        return "\n".join(lines)
     
-    def decompile_to_file(self, machine_code: List[int], output_file: str, **kwargs):
+    def decompile_to_file(self, machine_code: MachineCode, output_file: str, **kwargs):
         """Decompile and save to file"""
         assembly_code = self.decompile(machine_code, **kwargs)
         with open(output_file, 'w') as f:
@@ -264,6 +282,23 @@ class CPUDecompiler:
         print(f"Decompiled assembly saved to: {output_file}")
 
 
+def parse_code_list(text: str) -> List[int]:
+    """
+    Parse a Python list of integers such as '[49, 237, 76]', plain decimal lists are split directly and
+    only other literal formats (hex, trailing commas, ...) go through ast.literal_eval
+    """
+    text = text.strip()
+    if text.startswith("[") and text.endswith("]"):
+        try:
+            return [int(token) for token in text[1:-1].split(",")]
+        except ValueError:
+            pass
+    code = ast.literal_eval(text)
+    if not isinstance(code, list):
+        raise ValueError("Input must be a list")
+    return code
+
+
 def main(code):
     """Main decompiler function"""
     decompiler = CPUDecompiler()
@@ -272,15 +307,15 @@ def main(code):
     print(f"Decompiling {len(code)} bytes of machine code...")
     print()
     
-    result = decompiler.decompile(code, include_comments=True, include_addresses=False)
-    for idx, line in enumerate(result.split("\n")):
-        print(f"{idx+1:04}: {line}")
+    # Write the numbered listing in batches of lines rather than with one print per line
+    lines = decompiler.iter_lines(code, include_comments=True, include_addresses=False)
+    numbered = (f"{idx:04}: {line}\n" for idx, line in enumerate(lines, 1))
+    while batch := "".join(islice(numbered, 4096)):
+        sys.stdout.write(batch)
 
 
 if __name__ == "__main__":
     import argparse
-    import ast
-    import sys
     
     parser = argparse.ArgumentParser(
         description="Decompile CPU machine code to assembly",
@@ -342,9 +377,7 @@ Examples:
                 
             # Try to parse as Python list first
             try:
-                machine_code = ast.literal_eval(content)
-                if not isinstance(machine_code, list):
-                    raise ValueError("File content is not a list")
+                machine_code = parse_code_list(content)
             except (ValueError, SyntaxError):
                 # Parse as one integer per line
                 lines = content.splitlines()
@@ -360,9 +393,7 @@ Examples:
         else:
             # Parse from command line argument
             try:
-                machine_code = ast.literal_eval(args.code)
-                if not isinstance(machine_code, list):
-                    raise ValueError("Input must be a list")
+                machine_code = parse_code_list(args.code)
             except (ValueError, SyntaxError) as e:
                 print(f"Error: Invalid Python list format: {e}", file=sys.stderr)
                 print("Example: '[49, 237, 76, 238, 1]'", file=sys.stderr)
@@ -7,49 +7,86 @@ Accurately parses assembly files by scanning sequentially and tracking all label
 import argparse
 import re
 import sys
-from typing import Dict, List, Set, Tuple, Optional
+from types import MappingProxyType
+from typing import ClassVar, Dict, FrozenSet, List, Mapping, Set, Tuple, Optional
+
+# Label definitions, only tried on lines starting with ':'
+LABEL_PATTERN = re.compile(r'^:(\w+)')
+
+# Directives whose lines define constants and macros rather than emit instructions
+DEFINITIONS = frozenset({'CONST', 'CONSTANT', 'MACRO', 'ENDMACRO'})
+
+# Node styling in the DOT output: entry point names, then keywords that classify a node by its name
+ENTRY_POINTS = frozenset({"ENTRY", "START", "INIT", "USER_MAIN", "_START"})
+LIBRARY_KEYWORDS = ("MEMSET", "MEMCPY", "MEMCMP", "PUSH", "POP")
+ERROR_KEYWORDS = ("ERROR", "FAIL")
+EXIT_KEYWORDS = ("SUCCESS", "VICTORY", "WIN", "CLEANUP", "EXIT", "DONE")
+LOOP_KEYWORDS = ("LOOP", "REPEAT", "CONTINUE", "RETRY")
+DEAD_KEYWORDS = ("DEAD", "UNREACHABLE", "ORPHANED")
+
+# Label name parts marking labels inside a function, and prefixes of library routines that flow into each other
+INTERNAL_LABEL_MARKERS = ('_LOOP', '_OK', '_DONE', '_CONTINUE', '_READ', '_UPDATE')
+LIBRARY_PREFIXES = frozenset(LIBRARY_KEYWORDS)
+
+# Jump instructions that affect control flow, read-only so no analyzer can change it for the others
+JUMP_INSTRUCTIONS = MappingProxyType({
+    'JMP': 'unconditional',
+    'JNZ': 'conditional', 
+    'JMZ': 'conditional',
+    'JNN': 'conditional',
+    'JMN': 'conditional', 
+    'JNO': 'conditional',
+    'JMO': 'conditional',
+    'IJX': 'conditional',
+    'IZA': 'conditional',
+    'IJA': 'conditional',
+    'IJY': 'conditional',
+    'JFA': 'relative',
+    'JFX': 'relative',
+    'JFY': 'relative',
+    'JBA': 'relative',
+    'JBX': 'relative',
+    'JBY': 'relative',
+    'JAD': 'indirect',
+    'RPC': 'indirect',
+})
+
+# DOT attributes for each kind of control flow edge, anything else is drawn unstyled
+EDGE_STYLES = MappingProxyType({
+    'unconditional': ' [color=red, label="JMP", penwidth=2]',
+    'conditional': ' [color=blue, label="conditional"]',
+    'fallthrough': ' [color=gray, style=dashed]',
+    'relative': ' [color=orange, label="relative"]',
+    'indirect': ' [color=purple, label="indirect"]',
+})
 
 
 class ControlFlowAnalyzer:
     """Analyzes control flow in assembly programs and generates DOT graphs"""
     
-    def __init__(self):
-        # Jump instructions that affect control flow
-        self.jump_instructions = {
-            'JMP': 'unconditional',
-            'JNZ': 'conditional', 
-            'JMZ': 'conditional',
-            'JNN': 'conditional',
-            'JMN': 'conditional', 
-            'JNO': 'conditional',
-            'JMO': 'conditional',
-            'JFA': 'relative',
-            'JFX': 'relative',
-            'JFY': 'relative',
-            'JBA': 'relative',
-            'JBX': 'relative',
-            'JBY': 'relative',
-            'JAD': 'indirect',
-            'RPC': 'indirect',
-        }
-        
-        # Instructions that end execution flow
-        self.terminal_instructions = {'HLT'}
-        
-        # Our CPU's instruction set
-        self.cpu_instructions = {
-            'HLT', 'CLR', 'NOP', 'AAX', 'AAY', 'AXY', 'SAX', 'SAY', 'SXY',
-            'INA', 'INX', 'INY', 'DEA', 'DEX', 'DEY', 'NAX', 'NAY', 'NXY',
-            'OAX', 'OAY', 'OXY', 'XAX', 'XAY', 'XXY', 'BLA', 'BLX', 'BLY',
-            'BRA', 'BRX', 'BRY', 'EAX', 'EAY', 'EXY', 'JMP', 'JNZ', 'JMZ',
-            'JNN', 'JMN', 'JNO', 'JMO', 'JFA', 'JFX', 'JFY', 'JBA', 'JBX',
-            'JBY', 'JAD', 'WPC', 'RPC', 'LDA', 'LDX', 'LDY', 'CAX', 'CAY',
-            'CXY', 'CYX', 'CXA', 'CYA', 'CAZ', 'NAZ', 'CAO', 'NAO', 'CAN',
-            'NAN', 'CXZ', 'NXZ', 'CXO', 'NXO', 'CXN', 'NXN', 'CYZ', 'NYZ',
-            'CYO', 'NYO', 'CYN', 'NYN', 'WMA', 'WMX', 'WMY', 'RMA', 'RMX',
-            'RMY', 'RMI', 'WMI', 'RMO', 'WMO', 'FIL', 'CMP', 'CPY'
-        }
+    # The shared, read-only JUMP_INSTRUCTIONS table
+    jump_instructions: ClassVar[Mapping[str, str]] = JUMP_INSTRUCTIONS
+    
+    # Instructions that end execution flow
+    terminal_instructions: ClassVar[FrozenSet[str]] = frozenset({'HLT'})
+    
+    # Our CPU's instruction set
+    cpu_instructions: ClassVar[FrozenSet[str]] = frozenset({
+        'HLT', 'CLR', 'NOP', 'AAX', 'AAY', 'AXY', 'SAX', 'SAY', 'SXY',
+        'INA', 'INX', 'INY', 'DEA', 'DEX', 'DEY', 'NAX', 'NAY', 'NXY',
+        'OAX', 'OAY', 'OXY', 'XAX', 'XAY', 'XXY', 'BLA', 'BLX', 'BLY',
+        'BRA', 'BRX', 'BRY', 'EAX', 'EAY', 'EXY', 'JMP', 'JNZ', 'JMZ',
+        'JNN', 'JMN', 'JNO', 'JMO', 'JFA', 'JFX', 'JFY', 'JBA', 'JBX',
+        'JBY', 'JAD', 'WPC', 'RPC', 'LDA', 'LDX', 'LDY', 'CAX', 'CAY',
+        'CXY', 'CYX', 'CXA', 'CYA', 'CAZ', 'NAZ', 'CAO', 'NAO', 'CAN',
+        'NAN', 'CXZ', 'NXZ', 'CXO', 'NXO', 'CXN', 'NXN', 'CYZ', 'NYZ',
+        'CYO', 'NYO', 'CYN', 'NYN', 'WMA', 'WMX', 'WMY', 'RMA', 'RMX',
+        'RMY', 'RMI', 'WMI', 'RMO', 'WMO', 'FIL', 'CMP', 'CPY', 'LWX',
+        'IJX', 'CYR', 'RAX', 'XWA', 'YWA', 'LWA', 'IZA', 'CLL', 'IJA',
+        'IJY', 'LSA'
+    })
 
+    def __init__(self):
         # Common macro patterns
         self.macro_patterns = {
             'CALL': self.expand_call_macro,
@@ -150,83 +187,72 @@ class ControlFlowAnalyzer:
             Tuple of (all_labels, jumps_dict)
         """
         try:
-            with open(filename, 'r') as f:
-                lines = f.readlines()
+            source = open(filename, 'r')
         except FileNotFoundError:
             raise FileNotFoundError(f"Assembly file not found: {filename}")
         
-        # First pass: expand macros and collect all lines
-        expanded_lines = []
+        # Single pass: collect labels, expand macros and record the jumps made under each label
+        jumps_dict = {}
         current_label = None
         all_labels = []
+        jump_instructions, macro_patterns = self.jump_instructions, self.macro_patterns
         
-        for line_num, line in enumerate(lines, 1):
-            original_line = line.rstrip()
-            clean_line = line.split(';')[0].strip()
-            
-            if not clean_line:
-                continue
-            
-            # Check for label definition
-            label_match = re.match(r'^:(\w+)', clean_line)
-            if label_match:
-                label_name = label_match.group(1)
-                all_labels.append(label_name)
-                current_label = label_name
-                continue
-            
-            # Skip constants and macro definitions
-            if re.match(r'^\s*(CONST|CONSTANT|MACRO|ENDMACRO)\s+', clean_line, re.IGNORECASE):
-                continue
-            
-            # Parse instruction
-            parts = clean_line.split()
-            if not parts:
-                continue
-            
-            instruction = parts[0].upper()
-            
-            # Expand macros
-            if instruction in self.macro_patterns:
-                expanded = self.macro_patterns[instruction](parts)
-                expanded_lines.extend([(current_label, exp_line) for exp_line in expanded])
-            else:
-                # Regular instruction
-                expanded_lines.append((current_label, clean_line))
-        
-        # Second pass: find all jumps
-        jumps_dict = {}
-        
-        for current_label, line in expanded_lines:
-            if not current_label:
-                continue
+        # Lines are read as they are parsed rather than loading the whole file first
+        with source:
+            for line_num, line in enumerate(source, 1):
+                clean_line = line.split(';', 1)[0].strip()
                 
-            parts = line.split()
-            if len(parts) < 2:
-                continue
-            
-            instruction = parts[0].upper()
-            
-            # Check if this is a jump instruction
-            if instruction in self.jump_instructions:
-                target = parts[1]
-                jump_type = self.jump_instructions[instruction]
+                if not clean_line:
+                    continue
+                
+                # Check for label definition
+                if clean_line[0] == ':':
+                    label_match = LABEL_PATTERN.match(clean_line)
+                    if label_match:
+                        label_name = sys.intern(label_match.group(1))
+                        all_labels.append(label_name)
+                        current_label = label_name
+                        continue
+                
+                # Jumps are only tracked from inside a labelled block
+                if not current_label:
+                    continue
+                
+                # Parse instruction
+                parts = clean_line.split()
+                instruction = parts[0].upper()
                 
-                if current_label not in jumps_dict:
-                    jumps_dict[current_label] = []
+                # Skip constants and macro definitions
+                if instruction in DEFINITIONS and len(parts) > 1:
+                    continue
                 
-                jumps_dict[current_label].append((target, jump_type))
+                # Expand macros into the instructions they stand for
+                if instruction in macro_patterns:
+                    expanded = [exp_line.split() for exp_line in macro_patterns[instruction](parts)]
+                else:
+                    expanded = [parts]
+                
+                for parts in expanded:
+                    if len(parts) < 2:
+                        continue
+                    
+                    # Check if this is a jump instruction
+                    jump_type = jump_instructions.get(parts[0].upper())
+                    if jump_type is not None:
+                        jumps_dict.setdefault(current_label, []).append((sys.intern(parts[1]), jump_type))
         
         return all_labels, jumps_dict
     
     def build_control_flow_graph(self, all_labels: List[str], jumps_dict: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, str]]]:
         """Build control flow graph from labels and jumps"""
         
-        graph = {}
+        # Each node's edges are kept as dict keys while building: an ordered set, so adding an edge
+        # twice is a hash lookup rather than a scan of the list
+        graph: Dict[str, Dict[Tuple[str, str], None]] = {}
         
         # Initialize all labels as nodes
         for label in all_labels:
-            graph[label] = []
+            graph[label] = {}
         
         # Add jump edges
         for source_label, jump_list in jumps_dict.items():
@@ -234,11 +260,9 @@ class ControlFlowAnalyzer:
                 for target, jump_type in jump_list:
                     # Add target to graph if it doesn't exist (external reference)
                     if target not in graph:
-                        graph[target] = []
+                        graph[target] = {}
                     
-                    edge = (target, jump_type)
-                    if edge not in graph[source_label]:
-                        graph[source_label].append(edge)
+                    graph[source_label][(target, jump_type)] = None
         
         # Add fall-through edges between consecutive labels
         # This is more sophisticated - we need to check if labels are terminal
@@ -250,12 +274,11 @@ class ControlFlowAnalyzer:
             has_unconditional_jump = False
             has_any_jump = False
             
-            if current_label in jumps_dict:
-                for target, jump_type in jumps_dict[current_label]:
-                    has_any_jump = True
-                    if jump_type == 'unconditional':
-                        has_unconditional_jump = True
-                        break
+            for target, jump_type in jumps_dict.get(current_label, ()):
+                has_any_jump = True
+                if jump_type == 'unconditional':
+                    has_unconditional_jump = True
+                    break
             
             # Add fall-through in these cases:
             # 1. Label has no jumps at all (pure fall-through)
@@ -268,16 +291,14 @@ class ControlFlowAnalyzer:
             )
             
             if should_fall_through:
-                edge = (next_label, 'fallthrough')
-                if edge not in graph[current_label]:
-                    graph[current_label].append(edge)
+                graph[current_label][(next_label, 'fallthrough')] = None
         
-        return graph
+        return {label: list(edges) for label, edges in graph.items()}
     
     def is_internal_label(self, current_label: str, next_label: str) -> bool:
         """Check if these are internal labels within the same function"""
         # Common patterns for internal labels within functions
-        if any(pattern in current_label.upper() for pattern in ['_LOOP', '_OK', '_DONE', '_CONTINUE', '_READ', '_UPDATE']):
+        if any(pattern in current_label.upper() for pattern in INTERNAL_LABEL_MARKERS):
             # If the next label also looks internal and they share a prefix, they're related
             current_prefix = current_label.split('_')[0]
             next_prefix = next_label.split('_')[0]
@@ -286,8 +307,7 @@ class ControlFlowAnalyzer:
                 return True
             
             # Special cases for common internal flow patterns
-            if (current_prefix in ['MEMSET', 'MEMCPY', 'MEMCMP', 'PUSH', 'POP'] and
-                next_prefix in ['MEMSET', 'MEMCPY', 'MEMCMP', 'PUSH', 'POP']):
+            if current_prefix in LIBRARY_PREFIXES and next_prefix in LIBRARY_PREFIXES:
                 return True
         
         return False
@@ -311,17 +331,18 @@ class ControlFlowAnalyzer:
         
         # Add node definitions with styling
         for node in sorted(all_nodes):
-            if node in ["ENTRY", "START", "INIT", "USER_MAIN", "_START"]:
+            name = node.upper()
+            if node in ENTRY_POINTS:
                 dot_lines.append(f'    "{node}" [fillcolor=lightgreen, label="{node}\\n(Entry Point)"];')
-            elif any(keyword in node.upper() for keyword in ["MEMSET", "MEMCPY", "MEMCMP", "PUSH", "POP"]):
+            elif any(keyword in name for keyword in LIBRARY_KEYWORDS):
                 dot_lines.append(f'    "{node}" [fillcolor=lightblue, label="{node}\\n(Library)"];')
-            elif any(keyword in node.upper() for keyword in ["ERROR", "FAIL"]):
+            elif any(keyword in name for keyword in ERROR_KEYWORDS):
                 dot_lines.append(f'    "{node}" [fillcolor=pink];')
-            elif any(keyword in node.upper() for keyword in ["SUCCESS", "VICTORY", "WIN", "CLEANUP", "EXIT", "DONE"]):
+            elif any(keyword in name for keyword in EXIT_KEYWORDS):
                 dot_lines.append(f'    "{node}" [fillcolor=lightcyan];')
-            elif any(keyword in node.upper() for keyword in ["LOOP", "REPEAT", "CONTINUE", "RETRY"]):
+            elif any(keyword in name for keyword in LOOP_KEYWORDS):
                 dot_lines.append(f'    "{node}" [fillcolor=lightyellow];')
-            elif any(keyword in node.upper() for keyword in ["DEAD", "UNREACHABLE", "ORPHANED"]):
+            elif any(keyword in name for keyword in DEAD_KEYWORDS):
                 dot_lines.append(f'    "{node}" [fillcolor=lightgray];')
             else:
                 dot_lines.append(f'    "{node}" [fillcolor=white];')
@@ -330,23 +351,10 @@ class ControlFlowAnalyzer:
         
         # Add edges with styling
         dot_lines.append('    // Control flow edges')
-        for source in sorted(graph.keys()):
-            for target, edge_type in graph[source]:
-                if edge_type == 'unconditional':
-                    dot_lines.append(f'    "{source}" -> "{target}" [color=red, label="JMP", penwidth=2];')
-                elif edge_type == 'conditional':
-                    dot_lines.append(f'    "{source}" -> "{target}" [color=blue, label="conditional"];')
-                elif edge_type == 'fallthrough':
-                    dot_lines.append(f'    "{source}" -> "{target}" [color=gray, style=dashed];')
-                elif edge_type == 'relative':
-                    dot_lines.append(f'    "{source}" -> "{target}" [color=orange, label="relative"];')
-                elif edge_type == 'indirect':
-                    dot_lines.append(f'    "{source}" -> "{target}" [color=purple, label="indirect"];')
-                else:
-                    dot_lines.append(f'    "{source}" -> "{target}";')
+        edge_lines = [f'    "{source}" -> "{target}"{EDGE_STYLES.get(edge_type, "")};'
+                      for source, edges in sorted(graph.items()) for target, edge_type in edges]
         
-        dot_lines.append('}')
-        return '\n'.join(dot_lines)
+        return '\n'.join(dot_lines + edge_lines + ['}'])
     
     def analyze_file(self, filename: str) -> str:
         """Analyze assembly file and return DOT format"""
@@ -1,6 +1,7 @@
 import os
+import re
 import sys
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -11,11 +12,29 @@ sys.path.insert(0, src_dir)
 
 try:
     from .instructions import InstructionSet, NameToOpcode
-    from .types import Data
+    from .types import Program
 except ImportError:
     # Fallback for direct execution
     from python_cpu_emulator.instructions import InstructionSet, NameToOpcode
-    from python_cpu_emulator.types import Data
+    from python_cpu_emulator.types import Program
+
+
+# Mnemonic -> (opcode, length), so one lookup gives everything the compiler needs about an instruction
+OPCODE_INFO: Dict[str, tuple[int, int]] = {sys.intern(name): (opcode, InstructionSet[opcode].length)
+                                           for name, opcode in NameToOpcode.items()}
+
+# Instruction sequences the optimizer replaces with a single superinstruction, longest first
+# Byte width of each operand: an address for length 2 and a byte for length 1, while a superinstruction
+# takes the operands of the sequence it fuses
+PARAM_WIDTHS: Dict[str, tuple[int, ...]] = {name: (length,) if length else () for name, (_, length) in OPCODE_INFO.items()}
+for _cls in InstructionSet.values():
+    if _cls.fuses:
+        PARAM_WIDTHS[_cls.__name__] = sum((PARAM_WIDTHS[name] for name in _cls.fuses), ())
+FUSIONS: List[tuple] = sorted(((cls.fuses, cls.__name__) for cls in InstructionSet.values() if cls.fuses),
+                              key=lambda fusion: len(fusion[0]), reverse=True)
+
+# Operators inside an expression, the lexer hands them to the parser as identifiers
+OPERATORS = frozenset({'>>', '<<', '-', '+', '*', '/', '(', ')', '&', '|', '^', '~', '%'})
 
 
 class TokenType(Enum):
@@ -68,196 +87,103 @@ class CompilerError(Exception):
         super().__init__(f"Line {line}, Column {column}: {message}")
 
 
+def hex_to_int(value: str) -> int:
+    """Converts a $ prefixed hex literal of 1-4 digits to an int, range: 0-65535"""
+    digits = value[1:]
+    if not 0 < len(digits) <= 4:
+        raise CompilerError(f"Hex value must have 1-4 digits: {value}")
+    return int(digits, 16)
+
+
 class Lexer:
     """Tokenizes assembly source code with macro support"""
     
+    # One alternation over every token type so a single regex scan does the lexing
+    TOKEN_PATTERN = re.compile(r"""
+          (?P<NEWLINE>\n)
+        | (?P<WHITESPACE>[ \t]+)
+        | (?P<COMMENT>;[^\n]*)
+        | :(?P<LABEL>[^\W\d]\w*)
+        | (?P<HEX_NUMBER>\$[0-9A-Fa-f]*)
+        | '(?P<CHARACTER>(?>\\[\s\S]?|[\s\S]?))'
+        | "(?P<STRING>(?:\\[\s\S]|[^"\\])*)"
+        | (?P<NUMBER>-?\d+)
+        | (?P<WORD>[^\W\d]\w*)
+        | (?P<OPERATOR>>>|<<|[-+*/()&|^~%])
+    """, re.VERBOSE)
+    
+    KEYWORDS = {
+        'CONST': TokenType.CONSTANT_DEF, 'CONSTANT': TokenType.CONSTANT_DEF,
+        'VAR': TokenType.VARIABLE_DEF, 'VARIABLE': TokenType.VARIABLE_DEF,
+        'MACRO': TokenType.MACRO_DEF, 'ENDMACRO': TokenType.MACRO_END,
+    }
+    
     def __init__(self, source: str):
         self.source = source
-        self.pos = 0
-        self.line = 1
-        self.column = 1
         self.tokens = []
     
-    def current_char(self) -> Optional[str]:
-        if self.pos >= len(self.source):
-            return None
-        return self.source[self.pos]
-    
-    def peek_char(self, offset: int = 1) -> Optional[str]:
-        peek_pos = self.pos + offset
-        if peek_pos >= len(self.source):
-            return None
-        return self.source[peek_pos]
-    
-    def advance(self):
-        if self.pos < len(self.source) and self.source[self.pos] == '\n':
-            self.line += 1
-            self.column = 1
-        else:
-            self.column += 1
-        self.pos += 1
-    
-    def skip_whitespace(self):
-        while self.current_char() and self.current_char() in ' \t': # type: ignore
-            self.advance()
-    
-    def read_number(self) -> str:
-        start_pos = self.pos
-        if self.current_char() == '-':
-            self.advance()
-        
-        while self.current_char() and self.current_char().isdigit(): # type: ignore
-            self.advance()
-        
-        return self.source[start_pos:self.pos]
-    
-    def read_hex_number(self) -> str:
-        start_pos = self.pos
-        self.advance()  # Skip '$'
-        
-        while (self.current_char() and 
-               self.current_char() in '0123456789ABCDEFabcdef'): # type: ignore
-            self.advance()
-        
-        return self.source[start_pos:self.pos]
-    
-    def read_identifier(self) -> str:
-        start_pos = self.pos
-        
-        while (self.current_char() and 
-               (self.current_char().isalnum() or self.current_char() in '_')): # type: ignore
-            self.advance()
-        
-        return self.source[start_pos:self.pos]
-    
-    def read_character(self) -> str:
-        self.advance()  # Skip opening quote
-        start_pos = self.pos
-        
-        if self.current_char() == '\\':
-            self.advance()  # Skip backslash
-            if self.current_char() is not None:
-                self.advance()  # Skip escaped character
-        elif self.current_char() is not None:
-            self.advance()  # Regular character
-        
-        value = self.source[start_pos:self.pos]
-        
-        if self.current_char() == "'":
-            self.advance()  # Skip closing quote
-        else:
-            raise CompilerError("Unterminated character literal", self.line, self.column)
-        
-        return value
-    
-    def read_string(self) -> str:
-        self.advance()  # Skip opening quote
-        start_pos = self.pos
-        
-        while self.current_char() is not None and self.current_char() != '"':
-            if self.current_char() == '\\':
-                self.advance()  # Skip backslash
-                if self.current_char() is not None:
-                    self.advance()  # Skip escaped character
-            else:
-                self.advance()
-        
-        value = self.source[start_pos:self.pos]
-        
-        if self.current_char() == '"':
-            self.advance()  # Skip closing quote
-        else:
-            raise CompilerError("Unterminated string literal", self.line, self.column)
-        
-        return value
-    
-    def read_comment(self) -> str:
-        start_pos = self.pos
-        while self.current_char() is not None and self.current_char() != '\n':
-            self.advance()
-        return self.source[start_pos:self.pos]
+    def position(self, offset: int) -> tuple[int, int]:
+        """Line and column of a source offset"""
+        line_start = self.source.rfind('\n', 0, offset) + 1
+        return self.source.count('\n', 0, offset) + 1, offset - line_start + 1
+    
+    def lexing_error(self, offset: int) -> CompilerError:
+        """Build the error for source that no token matches at offset"""
+        char = self.source[offset]
+        if char == ':':
+            return CompilerError("Invalid label format", *self.position(offset))
+        if char == "'":
+            # Point just past the one (possibly escaped) character a literal may hold
+            end = offset + 1
+            if self.source.startswith('\\', end):
+                end += 1
+            end = min(end + 1, len(self.source))
+            return CompilerError("Unterminated character literal", *self.position(end))
+        if char == '"':
+            return CompilerError("Unterminated string literal", *self.position(len(self.source)))
+        return CompilerError(f"Unexpected character: {char}", *self.position(offset))
     
     def tokenize(self) -> List[Token]:
-        while self.pos < len(self.source):
-            self.skip_whitespace()
-            
-            if self.current_char() is None:
-                break
-            
-            char = self.current_char()
-            line, column = self.line, self.column
-            
-            if char == '\n':
-                self.tokens.append(Token(TokenType.NEWLINE, char, line, column))
-                self.advance()
-            
-            elif char == ';':
-                comment = self.read_comment()
-                self.tokens.append(Token(TokenType.COMMENT, comment, line, column))
-            
-            elif char == ':':
-                self.advance()
-                if (self.current_char() and 
-                    (self.current_char().isalpha() or self.current_char() == '_')):  # type: ignore
-                    label = self.read_identifier()
-                    self.tokens.append(Token(TokenType.LABEL, label, line, column))
-                else:
-                    raise CompilerError("Invalid label format", line, column)
-            
-            elif char == '$':
-                hex_num = self.read_hex_number()
-                self.tokens.append(Token(TokenType.HEX_NUMBER, hex_num, line, column))
-            
-            elif char == "'":
-                char_literal = self.read_character()
-                self.tokens.append(Token(TokenType.CHARACTER, char_literal, line, column))
-            
-            elif char == '"':
-                string_literal = self.read_string()
-                self.tokens.append(Token(TokenType.STRING, string_literal, line, column))
-            
-            elif (char.isdigit() or  # type: ignore
-                (char == '-' and self.peek_char() is not None and self.peek_char().isdigit())): # type: ignore
-                number = self.read_number()
-                self.tokens.append(Token(TokenType.NUMBER, number, line, column))
+        source = self.source
+        tokens = self.tokens
+        match = self.TOKEN_PATTERN.match
+        keywords = self.KEYWORDS
+        line, line_start, pos = 1, 0, 0
+        
+        while pos < len(source):
+            token = match(source, pos)
+            if token is None:
+                raise self.lexing_error(pos)
+            kind = token.lastgroup
+            column = pos - line_start + 1
+            pos = token.end()
+            
+            if kind == 'NEWLINE':
+                tokens.append(Token(TokenType.NEWLINE, '\n', line, column))
+                line, line_start = line + 1, pos
+                continue
+            if kind == 'WHITESPACE':
+                continue
             
-            elif char.isalpha() or char == '_': # type: ignore
-                identifier = self.read_identifier()
-                
-                # Check for special keywords
-                if identifier.upper() in ['CONST', 'CONSTANT']:
-                    self.tokens.append(Token(TokenType.CONSTANT_DEF, identifier, line, column))
-                elif identifier.upper() in ['VAR', 'VARIABLE']:
-                    self.tokens.append(Token(TokenType.VARIABLE_DEF, identifier, line, column))
-                elif identifier.upper() == 'MACRO':
-                    self.tokens.append(Token(TokenType.MACRO_DEF, identifier, line, column))
-                elif identifier.upper() == 'ENDMACRO':
-                    self.tokens.append(Token(TokenType.MACRO_END, identifier, line, column))
-                elif identifier.upper() in NameToOpcode:
-                    self.tokens.append(Token(TokenType.INSTRUCTION, identifier.upper(), line, column))
+            value = token.group(kind)
+            if kind == 'WORD':
+                upper = value.upper()
+                if upper in keywords:
+                    tokens.append(Token(keywords[upper], value, line, column))
+                elif upper in OPCODE_INFO:
+                    tokens.append(Token(TokenType.INSTRUCTION, upper, line, column))
                 else:
-                    self.tokens.append(Token(TokenType.IDENTIFIER, identifier, line, column))
-            
-            # Handle multi-character operators
-            elif char == '>' and self.peek_char() == '>':
-                self.advance()  # consume first >
-                self.advance()  # consume second >
-                self.tokens.append(Token(TokenType.IDENTIFIER, '>>', line, column))
-            
-            elif char == '<' and self.peek_char() == '<':
-                self.advance()  # consume first 
-                self.advance()  # consume second 
-                self.tokens.append(Token(TokenType.IDENTIFIER, '<<', line, column))
-            
-            # Handle single-character operators and symbols
-            elif char in '+-*/()&|^~%':  # type: ignore
-                self.tokens.append(Token(TokenType.IDENTIFIER, char, line, column))  # type: ignore
-                self.advance()
-            
+                    tokens.append(Token(TokenType.IDENTIFIER, value, line, column))
+            elif kind == 'OPERATOR':
+                tokens.append(Token(TokenType.IDENTIFIER, value, line, column))
             else:
-                raise CompilerError(f"Unexpected character: {char}", line, column)
+                tokens.append(Token(TokenType[kind], value, line, column))
+                if kind in ('STRING', 'CHARACTER') and '\n' in value:
+                    # Literals may span lines
+                    line += value.count('\n')
+                    line_start = token.start(kind) + value.rfind('\n') + 1
         
-        self.tokens.append(Token(TokenType.EOF, "", self.line, self.column))
+        self.tokens.append(Token(TokenType.EOF, "", line, pos - line_start + 1))
         return self.tokens
 
 
@@ -295,8 +221,8 @@ class Parser:
     
     def evaluate_expression(self, value: str) -> int:
         """Evaluate arithmetic and bitwise expressions and resolve symbols"""
-        # Handle symbol substitution first
-        if value in self.symbols:
+        # Handle symbol substitution first (labels have no address until code generation)
+        if value in self.symbols and self.symbols[value].type != 'label':
             symbol = self.symbols[value]
             if isinstance(symbol.value, int):
                 return symbol.value
@@ -310,7 +236,7 @@ class Parser:
         
         # Handle hex numbers
         if value.startswith('$'):
-            return int(value[1:], 16)
+            return hex_to_int(value)
         
         # Handle simple decimal numbers (including negative)
         if value.lstrip('-').isdigit():
@@ -324,16 +250,14 @@ class Parser:
             # Sort by length (descending) to handle longer symbol names first
             sorted_symbols = sorted(self.symbols.items(), key=lambda x: len(x[0]), reverse=True)
             for symbol_name, symbol in sorted_symbols:
-                if isinstance(symbol.value, int) and symbol_name in expr:
+                if symbol.type != 'label' and isinstance(symbol.value, int) and symbol_name in expr:
                     # Use word boundaries to avoid partial replacements
-                    import re
                     pattern = r'\b' + re.escape(symbol_name) + r'\b'
                     expr = re.sub(pattern, str(symbol.value), expr)
             
             # Handle hex numbers in expressions
-            import re
-            hex_pattern = r'\$([0-9A-Fa-f]+)'
-            expr = re.sub(hex_pattern, lambda m: str(int(m.group(1), 16)), expr)
+            hex_pattern = r'\$[0-9A-Fa-f]+'
+            expr = re.sub(hex_pattern, lambda m: str(hex_to_int(m.group(0))), expr)
             
             # Handle character literals in expressions
             char_pattern = r"'(.?)'"
@@ -359,7 +283,6 @@ class Parser:
                 }
                 
                 # Validate that expression only contains safe characters and operators
-                import re
                 # Allow numbers, operators, parentheses, and whitespace
                 safe_pattern = r'^[0-9+\-*/()&|^<>\s%]+$'
                 if not re.match(safe_pattern, expr):
@@ -395,16 +318,29 @@ class Parser:
         else:
             raise CompilerError(f"Invalid character literal: {char_str}")
     
-    def parse_value(self) -> Union[int, str]:
-        """Parse a value or expression (number, hex, character, symbol, or complex expression)"""
+    def parse_value(self, operand: bool = False) -> Union[int, str]:
+        """Parse a value or expression (number, hex, character, symbol, or complex expression)
+
+        With operand set, stops at the end of one operand so that several can share a line, as in `CLL 1 2`
+        """
         # Collect tokens that form a complete expression
         expression_parts = []
+        depth = 0
         
         while (self.current_token().type in [TokenType.NUMBER, TokenType.HEX_NUMBER, 
                                             TokenType.CHARACTER, TokenType.IDENTIFIER] and
             self.current_token().type not in [TokenType.NEWLINE, TokenType.EOF, TokenType.COMMENT]):
             
             token = self.current_token()
+            is_operator = token.type == TokenType.IDENTIFIER and token.value in OPERATORS
+            # A value straight after a complete term, with no operator between them, starts the next operand
+            if (operand and expression_parts and depth == 0 and (not is_operator or token.value in '(~') and
+                    (expression_parts[-1] == ')' or expression_parts[-1] not in OPERATORS)):
+                break
+            if is_operator and token.value == '(':
+                depth += 1
+            elif is_operator and token.value == ')':
+                depth -= 1
             expression_parts.append(token.value)
             self.advance()
             
@@ -426,12 +362,15 @@ class Parser:
             if single_value.lstrip('-').isdigit():
                 return int(single_value)
             elif single_value.startswith('$'):
-                return int(single_value[1:], 16)
+                return hex_to_int(single_value)
             elif len(single_value) >= 2 and single_value.startswith("'") and single_value.endswith("'"):
                 return self.char_to_ascii(single_value[1:-1])
             elif single_value in self.symbols:
                 symbol = self.symbols[single_value]
-                if isinstance(symbol.value, int):
+                if symbol.type == 'label':
+                    # Labels stay symbolic until code generation, which may still move them
+                    return single_value
+                elif isinstance(symbol.value, int):
                     return symbol.value
                 else:
                     return self.evaluate_expression(str(symbol.value))
@@ -521,19 +460,14 @@ class Parser:
         if len(args) != len(macro.parameters):
             raise CompilerError(f"Macro {macro_name} expects {len(macro.parameters)} arguments, got {len(args)}")
         
-        # Create parameter substitution map
-        param_map = dict(zip(macro.parameters, args))
-        
-        # Expand macro body
-        expanded_lines = []
-        for line in macro.body:
-            expanded_line = line
-            # Replace parameters with arguments
-            for param, arg in param_map.items():
-                expanded_line = expanded_line.replace(param, arg)
-            expanded_lines.append(expanded_line)
+        if not macro.parameters:
+            return list(macro.body)
         
-        return expanded_lines
+        # Substitute every parameter in a single regex pass per line, matching whole identifiers only
+        param_map = dict(zip(macro.parameters, args))
+        names = sorted(param_map, key=len, reverse=True)
+        pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, names)) + r')\b')
+        return [pattern.sub(lambda match: param_map[match.group()], line) for line in macro.body]
     
     def parse_macro_call(self, macro_name: str):
         """Parse and expand a macro call"""
@@ -546,78 +480,67 @@ class Parser:
         # Expand macro
         expanded_lines = self.expand_macro(macro_name, args)
         
-        # Parse expanded lines as if they were inline code
-        for line in expanded_lines:
-            if line.strip():
-                # Re-tokenize and parse the expanded line
-                sub_lexer = Lexer(line + '\n')
-                sub_tokens = sub_lexer.tokenize()
-                
-                # Remove EOF token
-                if sub_tokens and sub_tokens[-1].type == TokenType.EOF:
-                    sub_tokens.pop()
-                
-                # Parse the tokens
-                old_pos = self.pos
-                old_tokens = self.tokens
-                
-                self.tokens = sub_tokens
-                self.pos = 0
-                
-                # Parse this line
-                while self.pos < len(self.tokens):
-                    if self.current_token().type == TokenType.NEWLINE:
-                        self.advance()
-                        continue
-                    elif self.current_token().type == TokenType.COMMENT:
-                        self.advance()
-                        continue
-                    elif self.current_token().type == TokenType.LABEL:
-                        self.parse_label()
-                    elif self.current_token().type == TokenType.INSTRUCTION:
-                        self.parse_instruction()
-                    elif self.current_token().type == TokenType.IDENTIFIER:
-                        # Could be a macro call or unknown instruction
-                        identifier = self.current_token().value
-                        if identifier in self.macros:
-                            self.advance()
-                            self.parse_macro_call(identifier)
-                        else:
-                            raise CompilerError(f"Unknown identifier: {identifier}", 
-                                              self.current_token().line, self.current_token().column)
-                    else:
-                        self.advance()
-                
-                # Restore original token stream
-                self.tokens = old_tokens
-                self.pos = old_pos
+        # Tokenize the whole expansion in one pass and parse it as if it were inline code
+        sub_tokens = Lexer('\n'.join(expanded_lines) + '\n').tokenize()
+        
+        old_pos = self.pos
+        old_tokens = self.tokens
+        
+        self.tokens = sub_tokens
+        self.pos = 0
+        
+        # The expansion keeps its EOF token: advance() never moves past the last token, so the end
+        # of the expansion has to be a token the loop can see
+        while self.current_token().type != TokenType.EOF:
+            if self.current_token().type == TokenType.NEWLINE:
+                self.advance()
+                continue
+            elif self.current_token().type == TokenType.COMMENT:
+                self.advance()
+                continue
+            elif self.current_token().type == TokenType.LABEL:
+                self.parse_label()
+            elif self.current_token().type == TokenType.INSTRUCTION:
+                self.parse_instruction()
+            elif self.current_token().type == TokenType.IDENTIFIER:
+                # Could be a macro call or unknown instruction
+                identifier = self.current_token().value
+                if identifier in self.macros:
+                    self.advance()
+                    self.parse_macro_call(identifier)
+                else:
+                    raise CompilerError(f"Unknown identifier: {identifier}", 
+                                      self.current_token().line, self.current_token().column)
+            else:
+                self.advance()
+        
+        # Restore original token stream
+        self.tokens = old_tokens
+        self.pos = old_pos
     
     def validate_instruction_parameters(self, instruction_name: str, params: List[Union[int, str]], line: int):
         """Validate instruction parameters"""
-        if instruction_name not in NameToOpcode:
+        widths = PARAM_WIDTHS.get(instruction_name)
+        if widths is None:
             raise CompilerError(f"Unknown instruction: {instruction_name}", line)
         
-        opcode = NameToOpcode[instruction_name]
-        instruction_class = InstructionSet[opcode]
-        expected_length = instruction_class.length
-        
-        if expected_length == 2:
+        if not widths:
+            if len(params) != 0:
+                raise CompilerError(f"Instruction {instruction_name} expects no parameters, got {len(params)}", line)
+        elif widths == (2,):
             if len(params) != 1:
                 raise CompilerError(f"Instruction {instruction_name} expects 1 address parameter, got {len(params)}", line)
-            param = params[0]
+        elif len(params) != len(widths):
+            raise CompilerError(f"Instruction {instruction_name} expects {len(widths)} parameter"
+                                f"{'s' if len(widths) > 1 else ''}, got {len(params)}", line)
+        
+        # Each operand is checked against its own width, superinstructions mix bytes and addresses
+        for param, width in zip(params, widths):
             if isinstance(param, int):
-                if not (0 <= param <= 65535):
+                if width == 2 and not (0 <= param <= 65535):
                     raise CompilerError(f"Address parameter for {instruction_name} must be 0-65535, got {param}", line)
-        elif expected_length == 1:
-            if len(params) != 1:
-                raise CompilerError(f"Instruction {instruction_name} expects 1 parameter, got {len(params)}", line)
-            param = params[0]
-            if isinstance(param, int):
-                if not (0 <= param <= 255):
+                if width == 1 and not (0 <= param <= 255):
                     raise CompilerError(f"Parameter for {instruction_name} must be 0-255, got {param}", line)
-        elif expected_length == 0:
-            if len(params) != 0:
-                raise CompilerError(f"Instruction {instruction_name} expects no parameters, got {len(params)}", line)
     
     def parse_instruction(self):
         """Parse an instruction with its parameters"""
@@ -626,9 +549,11 @@ class Parser:
         self.advance()
         
         parameters = []
+        # Instructions taking several operands read them one at a time, the rest treat the line as one expression
+        operand = len(PARAM_WIDTHS.get(instruction_name, ())) > 1
         
         while (self.current_token().type not in [TokenType.NEWLINE, TokenType.EOF, TokenType.COMMENT]):
-            param_value = self.parse_value()
+            param_value = self.parse_value(operand)
             parameters.append(param_value)
         
         self.validate_instruction_parameters(instruction_name, parameters, instr_token.line)
@@ -715,10 +640,57 @@ class Parser:
 class CodeGenerator:
     """Generates final machine code from parsed instructions"""
     
-    def __init__(self, instructions: List[Dict], symbols: Dict[str, Symbol]):
+    def __init__(self, instructions: List[Dict], symbols: Dict[str, Symbol], optimize: bool = False):
         self.instructions = instructions
         self.symbols = symbols
-        self.machine_code = []
+        self.optimize = optimize
+        self.machine_code = b''
+    
+    def fuse_instructions(self):
+        """Replace known instruction sequences with superinstructions, never fusing across a label"""
+        labels = [symbol for symbol in self.symbols.values() if symbol.type == 'label']
+        targets = {symbol.value for symbol in labels}
+        fused = []
+        new_index = {}
+        i = 0
+        while i < len(self.instructions):
+            new_index[i] = len(fused)
+            for sequence, name in FUSIONS:
+                count = len(sequence)
+                window = self.instructions[i:i + count]
+                if (tuple(instruction['name'] for instruction in window) == sequence and
+                        not any(i + offset in targets for offset in range(1, count))):
+                    fused.append({
+                        'type': 'instruction',
+                        'name': name,
+                        'parameters': [param for instruction in window for param in instruction['parameters']],
+                        'line': window[0]['line']
+                    })
+                    i += count
+                    break
+            else:
+                fused.append(self.instructions[i])
+                i += 1
+        new_index[len(self.instructions)] = len(fused)
+        
+        # Labels refer to instruction positions, which have moved
+        for symbol in labels:
+            symbol.value = new_index[symbol.value]
+        self.instructions = fused
+    
+    def assign_addresses(self) -> int:
+        """First pass: point every label at the byte address of its instruction, returning the program size"""
+        addresses = []
+        address = 0
+        for instruction in self.instructions:
+            addresses.append(address)
+            address += 1 + OPCODE_INFO[instruction['name']][1]
+        addresses.append(address)  # a label after the last instruction
+        
+        for symbol in self.symbols.values():
+            if symbol.type == 'label':
+                symbol.value = addresses[symbol.value]
+        return address
     
     def resolve_label_addresses(self):
         """Resolve label references to actual memory addresses"""
@@ -736,41 +708,50 @@ class CodeGenerator:
                         new_params.append(param)
                 instruction['parameters'] = new_params
     
-    def generate(self) -> Data:
+    def generate(self) -> Program:
         """Generate final machine code"""
+        if self.optimize:
+            self.fuse_instructions()
+        size = self.assign_addresses()
         self.resolve_label_addresses()
         
+        # Second pass: every label is known, so emit straight into a buffer of the final size
+        code = bytearray(size)
+        address = 0
         for instruction in self.instructions:
             if instruction['type'] == 'instruction':
-                instruction_name = instruction['name']
-                opcode = NameToOpcode[instruction_name]
-                instruction_class = InstructionSet[opcode]
+                opcode, length = OPCODE_INFO[instruction['name']]
+                parameters = instruction['parameters']
                 
-                self.machine_code.append(opcode)
+                code[address] = opcode
+                offset = address + 1
                 
-                for param in instruction['parameters']:
+                for param, width in zip(parameters, PARAM_WIDTHS[instruction['name']]):
                     if isinstance(param, int):
-                        if instruction_class.length == 2 and len(instruction['parameters']) == 1:
-                            # Single address parameter becomes two bytes
-                            high_byte = (param >> 8) & 0xFF
-                            low_byte = param & 0xFF
-                            self.machine_code.extend([high_byte, low_byte])
+                        if width == 2:
+                            # Address parameter becomes two bytes
+                            code[offset] = (param >> 8) & 0xFF
+                            code[offset + 1] = param & 0xFF
                         else:
                             # Single byte parameter
-                            self.machine_code.append(param & 0xFF)
+                            code[offset] = param & 0xFF
+                        offset += width
                     else:
                         raise CompilerError(f"Unresolved symbol: {param}")
+                address += 1 + length
         
+        self.machine_code = bytes(code)
         return self.machine_code
 
 
 class AdvancedCompiler:
     """Main compiler class with macro support"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, optimize: bool = False):
         self.verbose = verbose
+        self.optimize = optimize
     
-    def compile_file(self, filename: str) -> Data:
+    def compile_file(self, filename: str) -> Program:
         """Compile assembly file to machine code"""
         try:
             with open(filename, 'r') as f:
@@ -781,7 +762,7 @@ class AdvancedCompiler:
         except IOError as e:
             raise CompilerError(f"Error reading file {filename}: {e}")
     
-    def compile_source(self, source: str, filename: str = "<source>") -> Data:
+    def compile_source(self, source: str, filename: str = "<source>") -> Program:
         """Compile assembly source code to machine code"""
         try:
             if self.verbose:
@@ -804,10 +785,12 @@ class AdvancedCompiler:
                 print(f"Defined {len(parser.macros)} macros")
             
             # Code generation
-            generator = CodeGenerator(parser.instructions, parser.symbols)
+            generator = CodeGenerator(parser.instructions, parser.symbols, self.optimize)
             machine_code = generator.generate()
             
             if self.verbose:
+                if self.optimize:
+                    print(f"Fused into {len(generator.instructions)} instructions")
                 print(f"Generated {len(machine_code)} bytes of machine code")
             
             return machine_code
@@ -819,9 +802,9 @@ class AdvancedCompiler:
 
 
 # Backward compatibility functions
-def compile(filename: str, verbose=False) -> Data:
+def compile(filename: str, verbose=False, optimize=False) -> Program:
     """Main compile function for backward compatibility"""
-    compiler = AdvancedCompiler(verbose=verbose)
+    compiler = AdvancedCompiler(verbose=verbose, optimize=optimize)
     return compiler.compile_file(filename)
 
 
@@ -833,11 +816,12 @@ if __name__ == "__main__":
     parser.add_argument("-o", "--output", help="Output file for machine code")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     parser.add_argument("--hex", action="store_true", help="Output in hexadecimal format")
+    parser.add_argument("-O", "--optimize", action="store_true", help="Fuse common instruction sequences into superinstructions")
     
     args = parser.parse_args()
     
     try:
-        compiler = AdvancedCompiler(verbose=args.verbose)
+        compiler = AdvancedCompiler(verbose=args.verbose, optimize=args.optimize)
         machine_code = compiler.compile_file(args.input_file)
         
         if args.output:
@@ -846,14 +830,14 @@ if __name__ == "__main__":
                     hex_output = ' '.join(f"{byte:02X}" for byte in machine_code)
                     f.write(hex_output)
                 else:
-                    f.write(str(machine_code))
+                    f.write(str(list(machine_code)))
             print(f"Compiled to {args.output}")
         else:
             if args.hex:
                 hex_output = ' '.join(f"{byte:02X}" for byte in machine_code)
                 print(hex_output)
             else:
-                print(machine_code)
+                print(list(machine_code))
                 
     except CompilerError as e:
         print(f"Compilation error: {e}")
@@ -1,11 +1,13 @@
-from .instructions import InstructionList
-from .types import Flags, Registers, Data
+from .jit import kernel, counting_kernel, specialized_kernel
+from .types import Flags, Registers, Data, Memory, Program
 from .display import Display
-from .utils import BLANK_FLAGS, next_power_of_two
+from .utils import BLANK_FLAGS, HALT_FLAGS, next_power_of_two, registers_to_dict, flags_to_dict
 
 
 MIN_RAM_SIZE = 4       # 4KB ensures enough for 80x50 character display
 MAX_RAM_SIZE = 64      # 64KB max for 16-bit address space
+GPU_REFRESH_TICKS = 1000  # run() only considers redrawing the display every this many ticks
+PROFILE_TICKS = 100_000   # ticks specialize() profiles by default
 
 
 class CPU:
@@ -16,10 +18,11 @@ class CPU:
         :param gpu: Optional Display object for GPU functionality.
         """
         self.RAM_SIZE: int = next_power_of_two(min(MAX_RAM_SIZE, max(MIN_RAM_SIZE, ram_size))) * 1024 # Clamp RAM to power of 2 between 4KB-64KB
-        self.RAM: Data = [0] * self.RAM_SIZE
+        self.RAM_MASK: int = self.RAM_SIZE - 1  # RAM_SIZE is a power of 2, so addresses wrap with a single AND
+        self.RAM: Memory = bytearray(self.RAM_SIZE)
         self.GPU: Display|None = gpu
         # General Purpose Registers
-        self.REG: Registers = {'A': 0, 'X': 0, 'Y': 0, 'PC': 0}
+        self.REG: Registers = [0, 0, 0, 0]  # A, X, Y, PC
         # Status Registers
         self.FLAGS: Flags = BLANK_FLAGS
         # Tick Counter
@@ -27,68 +30,75 @@ class CPU:
         # GPU Setup
         self.GPU_SIZE: int = len(self.GPU) if self.GPU else -1
         self.GPU_OFFSET: int = self.RAM_SIZE - self.GPU_SIZE if self.GPU else -1
+        self.GPU_VIEW: memoryview | None = memoryview(self.RAM)[self.GPU_OFFSET:] if self.GPU else None  # framebuffer, no copy
+        self.GPU_FRAME: bytes = b''  # framebuffer contents when last drawn
+        # Execution kernel, replaced by specialize()
+        self.KERNEL = kernel
+        # Translated basic blocks by address, used when KERNEL is block_kernel
+        self.BLOCKS: dict[int, tuple] = {}
 
     @property
     def halted(self) -> bool:
-        return self.FLAGS['H']
+        return bool(self.FLAGS & HALT_FLAGS)
 
     def tick(self) -> None:
-        if self.FLAGS['H']:
+        if self.FLAGS & HALT_FLAGS:
             return
-        
-        # Fetch
-        pc = self.REG['PC']
-        opcode = self.RAM[pc]
-        
-        # Decode
-        instruction = InstructionList[opcode]
-        instruction_length = instruction.length
-        
-    
-        new_pc = (pc + 1 + instruction_length) & (self.RAM_SIZE - 1)
-        self.REG['PC'] = new_pc
-        
-        # Fetch instruction data efficiently
-        if instruction_length == 0:
-            data = []
-        elif instruction_length == 1:
-            data = [self.RAM[(pc + 1) & (self.RAM_SIZE - 1)]]
-        elif instruction_length == 2:
-            data = [self.RAM[(pc + 1) & (self.RAM_SIZE - 1)], 
-                    self.RAM[(pc + 2) & (self.RAM_SIZE - 1)]]
-        else:
-            # Fallback for longer instructions (rare)
-            data = [self.RAM[(pc + 1 + i) & (self.RAM_SIZE - 1)] 
-                    for i in range(instruction_length)]
-        
-        # Execute
-        self.REG, self.FLAGS = instruction.run(self.REG, self.FLAGS, data, self.RAM)
-        
+
+        # Fetch, decode and execute one instruction
+        self.KERNEL(self, self.TICKS + 1)
+
         # Draw GPU if required
-        if self.GPU and self.GPU.should_draw():
-            self.GPU.draw(self.RAM[self.GPU_OFFSET:])
-        
-        # Increment counter
-        self.TICKS += 1
+        if self.GPU:
+            self.refresh_display()
+
+    def refresh_display(self) -> None:
+        # Only redraw when a frame is due and the framebuffer changed since the last one
+        gpu, view = self.GPU, self.GPU_VIEW
+        if gpu and view is not None and gpu.should_draw() and view != self.GPU_FRAME:
+            self.GPU_FRAME = view.tobytes()
+            gpu.draw(view)
 
     def reset(self) -> None:
-        self.REG: Registers = {'A': 0, 'X': 0, 'Y': 0, 'PC': 0}
-        self.FLAGS: Flags = BLANK_FLAGS
-        self.RAM: Data = [0] * self.RAM_SIZE
+        self.REG[:] = [0, 0, 0, 0]
+        self.FLAGS = BLANK_FLAGS
+        self.RAM[:] = bytes(self.RAM_SIZE)  # zero in place so existing views stay valid
 
-    def load_data(self, data: Data, offset: int = 0) -> None:
+    def load_data(self, data: Program | Data, offset: int = 0) -> None:
         end = offset + len(data)
         if end <= self.RAM_SIZE:
             self.RAM[offset:end] = data
         else:
             raise ValueError(f"Data exceeds RAM size: {end} > {self.RAM_SIZE}")
 
+    def specialize(self, ticks: int = PROFILE_TICKS) -> None:
+        """
+        Profiles the loaded program on a scratch copy of this CPU, then switches to a kernel whose
+        dispatch reaches the most frequently executed opcodes in the fewest comparisons.
+        :param ticks: number of ticks to profile, default: 100,000
+        """
+        scratch = CPU(self.RAM_SIZE // 1024)
+        scratch.RAM[:] = self.RAM
+        scratch.REG[:] = self.REG
+        scratch.FLAGS = self.FLAGS
+        counts = [0] * 256
+        counting_kernel()(scratch, ticks, counts)
+        self.KERNEL = specialized_kernel(tuple(counts))
+
     def run(self, report_interval: int = 1_000_000) -> None:
+        # The kernel runs uninterrupted between reports and display refreshes
+        kernel, gpu = self.KERNEL, self.GPU
+        next_report = (self.TICKS // report_interval + 1) * report_interval
+        next_refresh = self.TICKS + GPU_REFRESH_TICKS
         try:
-            while not self.halted:
-                self.tick()
-                if self.TICKS % report_interval == 0:
+            while not self.FLAGS & HALT_FLAGS:
+                kernel(self, min(next_report, next_refresh) if gpu else next_report)
+                if self.TICKS == next_report:
                     print(self)
+                    next_report += report_interval
+                if gpu and self.TICKS == next_refresh:
+                    self.refresh_display()
+                    next_refresh += GPU_REFRESH_TICKS
         except KeyboardInterrupt:
             print("Execution interrupted by user.")
         finally:
@@ -96,4 +106,4 @@ class CPU:
             print(self)
 
     def __str__(self) -> str:
-        return f"Ticks: {self.TICKS:,} Registers: {self.REG} Flags: {self.FLAGS}"
\ No newline at end of file
+        return f"Ticks: {self.TICKS:,} Registers: {registers_to_dict(self.REG)} Flags: {flags_to_dict(self.FLAGS)}"
\ No newline at end of file
@@ -14,15 +14,12 @@ class Display:
             return False
         return True
 
-    def draw(self, data: list[int]):
+    def draw(self, data: bytes | bytearray | memoryview):
         assert len(data) == len(self), f"GPU Error: received {len(data):,} pixels but require {len(self)}"
         self.last_drawn = time()
-        lines = []
-        for h in range(self.HEIGHT):
-            start = h * self.WIDTH
-            line = ''.join(chr(data[start + w]) for w in range(self.WIDTH))
-            lines.append(line)    
-        print('\n'.join(lines))
+        # latin-1 maps every byte to the character with the same code point, i.e. chr() for the whole frame at once
+        text = bytes(data).decode('latin-1')
+        print('\n'.join(text[start:start + self.WIDTH] for start in range(0, len(text), self.WIDTH)))
 
     def __len__(self) -> int:
         return self.WIDTH * self.HEIGHT
@@ -1,53 +1,28 @@
-import inspect
-import importlib
-import pkgutil
-from .base import BaseInstruction
+from .base import BaseInstruction, get_instructions
+# Each class registers itself with base as it is defined, so importing the modules in this fixed
+# order assigns their opcodes; append new modules at the end to keep existing opcodes stable
+from . import arithmetic, bitwise, comparison, control, load_store, memory, superinstructions
 
 # Build the instruction mappings
 InstructionSet: dict[int, type] = {}
 NameToOpcode: dict[str, int] = {}
 OpcodeToName: dict[int, str] = {}
 
-def _collect_instructions():
-    """Automatically discover and import all instruction modules in this package"""
-    
-    # Get the current package path
-    package_path = __path__[0]  # type: ignore
-    package_name = __name__
-    
-    # Discover all modules in the instructions package
-    for _, modname, _ in pkgutil.iter_modules([package_path]):
-        # Skip the base module as it doesn't contain instruction classes
-        if modname == 'base':
-            continue
-            
-        # Import the module dynamically
-        full_module_name = f"{package_name}.{modname}"
-        try:
-            module = importlib.import_module(full_module_name)
-            
-            # Scan the module for instruction classes
-            for name, cls in inspect.getmembers(module, inspect.isclass):
-                if (hasattr(cls, "opcode") and 
-                    cls.opcode > -1 and 
-                    issubclass(cls, BaseInstruction) and 
-                    cls != BaseInstruction):
-                    
-                    if cls.opcode in InstructionSet:
-                        raise ValueError(f"Duplicate opcode {cls.opcode} for classes {InstructionSet[cls.opcode].__name__} and {name}")
-                    
-                    InstructionSet[cls.opcode] = cls
-                    NameToOpcode[name] = cls.opcode
-                    OpcodeToName[cls.opcode] = name
-                    
-        except ImportError as e:
-            print(f"Warning: Could not import instruction module {full_module_name}: {e}")
+# Fill all three mappings in one pass over the registered classes
+for opcode, cls in sorted(get_instructions().items()):
+    InstructionSet[opcode] = cls
+    NameToOpcode[cls.__name__] = opcode
+    OpcodeToName[opcode] = cls.__name__
 
-# Initialize the mappings
-_collect_instructions()
+# Create the instruction list for quick lookup, opcodes without an instruction decode as HLT
+# so every byte value indexes straight into the tables below with no KeyError fallback
+InstructionList: tuple[type, ...] = tuple(InstructionSet.get(i, InstructionSet[0]) for i in range(256))
 
-# Create the instruction list for quick lookup
-InstructionList: list[type] = [InstructionSet.get(i, InstructionSet[0]) for i in range(256)]
+# Flat per-opcode tables, one entry per opcode (lengths packed one byte each). They are immutable
+# because the execution kernel is generated from them at import and would not see later changes
+Handlers: tuple = tuple(instruction.run for instruction in InstructionList)
+Lengths: bytes = bytes(instruction.length for instruction in InstructionList)
+MAX_LENGTH: int = max(Lengths)
 
 # Export the key components
-__all__ = ['BaseInstruction', 'InstructionSet', 'NameToOpcode', 'OpcodeToName', 'InstructionList']
\ No newline at end of file
+__all__ = ['BaseInstruction', 'InstructionSet', 'NameToOpcode', 'OpcodeToName', 'InstructionList', 'Handlers', 'Lengths', 'MAX_LENGTH']
\ No newline at end of file
@@ -1,5 +1,5 @@
-from .base import BaseInstruction, validate
-from ..types import Flags, Registers, Data
+from .base import BaseInstruction, validate, A, X, Y
+from ..types import Flags, Registers, Operands, Memory
 
 
 class AAX(BaseInstruction):
@@ -9,9 +9,9 @@ class AAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] + reg['X'])
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] + reg[X])
+        return flags
 
 
 class AAY(BaseInstruction):
@@ -21,9 +21,9 @@ class AAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] + reg['Y'])
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] + reg[Y])
+        return flags
 
 
 class AXY(BaseInstruction):
@@ -33,9 +33,9 @@ class AXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'], flags = validate(reg['X'] + reg['Y'])
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X], flags = validate(reg[X] + reg[Y])
+        return flags
 
 
 class SAX(BaseInstruction):
@@ -45,9 +45,9 @@ class SAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] - reg['X'])
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] - reg[X])
+        return flags
 
 
 class SAY(BaseInstruction):
@@ -57,9 +57,9 @@ class SAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] - reg['Y'])
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] - reg[Y])
+        return flags
 
 
 class SXY(BaseInstruction):
@@ -69,9 +69,9 @@ class SXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'], flags = validate(reg['X'] - reg['Y'])
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X], flags = validate(reg[X] - reg[Y])
+        return flags
 
 
 class INA(BaseInstruction):
@@ -81,9 +81,9 @@ class INA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] + 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] + 1)
+        return flags
 
 
 class INX(BaseInstruction):
@@ -93,9 +93,9 @@ class INX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'], flags = validate(reg['X'] + 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X], flags = validate(reg[X] + 1)
+        return flags
 
 
 class INY(BaseInstruction):
@@ -105,9 +105,9 @@ class INY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'], flags = validate(reg['Y'] + 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y], flags = validate(reg[Y] + 1)
+        return flags
 
 
 class DEA(BaseInstruction):
@@ -117,9 +117,9 @@ class DEA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] - 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] - 1)
+        return flags
 
 
 class DEX(BaseInstruction):
@@ -129,9 +129,9 @@ class DEX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'], flags = validate(reg['X'] - 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X], flags = validate(reg[X] - 1)
+        return flags
 
 
 class DEY(BaseInstruction):
@@ -141,6 +141,6 @@ class DEY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'], flags = validate(reg['Y'] - 1)
-        return reg, flags
\ No newline at end of file
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y], flags = validate(reg[Y] - 1)
+        return flags
\ No newline at end of file
@@ -1,6 +1,6 @@
-from abc import ABC, abstractmethod
-from ..utils import set_flags, data_to_memory_location, BLANK_FLAGS, HALT_FLAGS, ZERO_FLAGS
-from ..types import Flags, Registers, Data
+from ..utils import (set_flags, data_to_memory_location, A, X, Y, PC,
+                     BLANK_FLAGS, HALT_FLAGS, ZERO_FLAGS, OVERFLOW_FLAGS, NEGATIVE_FLAGS)
+from ..types import Flags, Registers, Operands, Memory
 
 
 BYTE_SIZE = 256
@@ -51,26 +51,42 @@ _opcode_manager.reserve(1, 'CLR')
 _opcode_manager.reserve(2, 'NOP')
 
 
+# Every instruction class defined so far, keyed by opcode
+_instructions: dict[int, type] = {}
+
+
 def get_opcode(class_name: str) -> int:
     """Get an opcode for the given class name"""
     return _opcode_manager.get_opcode(class_name)
 
 
-class BaseInstruction(ABC):
+def get_instructions() -> dict[int, type]:
+    """Get all defined instruction classes keyed by opcode"""
+    return dict(_instructions)
+
+
+class BaseInstruction:
     """Base Instruction
 
     opcode: int -- the unique opcode for this instruction, range: 0-255
     length: int -- the number of bytes of data the instruction requires to operate, range: 0-255
+    fuses: tuple[str, ...] -- for superinstructions, the instruction sequence this one replaces when optimizing
     """
     opcode: int = -1
     length: int = -1
+    fuses: tuple[str, ...] = ()
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         if cls.__name__ not in ['BaseInstruction']:
+            # Instructions are never instantiated, so check for run() here rather than with an ABC
+            if cls.run is BaseInstruction.run:
+                raise TypeError(f"Instruction {cls.__name__} does not define run()")
             cls.opcode = get_opcode(cls.__name__)
+            if cls.opcode in _instructions:
+                raise ValueError(f"Duplicate opcode {cls.opcode} for classes {_instructions[cls.opcode].__name__} and {cls.__name__}")
+            _instructions[cls.opcode] = cls
 
     @staticmethod
-    @abstractmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        pass
\ No newline at end of file
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        raise NotImplementedError
\ No newline at end of file
@@ -1,5 +1,5 @@
-from .base import BaseInstruction, validate, set_flags
-from ..types import Flags, Registers, Data
+from .base import BaseInstruction, validate, set_flags, A, X, Y
+from ..types import Flags, Registers, Operands, Memory
 
 
 class NAX(BaseInstruction):
@@ -9,9 +9,9 @@ class NAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] &= reg['X']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] &= reg[X]
+        return set_flags(reg[A])
 
 
 class NAY(BaseInstruction):
@@ -21,9 +21,9 @@ class NAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] &= reg['Y']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] &= reg[Y]
+        return set_flags(reg[A])
 
 
 class NXY(BaseInstruction):
@@ -33,9 +33,9 @@ class NXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] &= reg['Y']
-        return reg, set_flags(reg['X'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] &= reg[Y]
+        return set_flags(reg[X])
 
 
 class OAX(BaseInstruction):
@@ -45,9 +45,9 @@ class OAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] |= reg['X']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] |= reg[X]
+        return set_flags(reg[A])
 
 
 class OAY(BaseInstruction):
@@ -57,9 +57,9 @@ class OAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] |= reg['Y']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] |= reg[Y]
+        return set_flags(reg[A])
 
 
 class OXY(BaseInstruction):
@@ -69,9 +69,9 @@ class OXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] |= reg['Y']
-        return reg, set_flags(reg['X'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] |= reg[Y]
+        return set_flags(reg[X])
 
 
 class XAX(BaseInstruction):
@@ -81,9 +81,9 @@ class XAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] ^= reg['X']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] ^= reg[X]
+        return set_flags(reg[A])
 
 
 class XAY(BaseInstruction):
@@ -93,9 +93,9 @@ class XAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] ^= reg['Y']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] ^= reg[Y]
+        return set_flags(reg[A])
 
 
 class XXY(BaseInstruction):
@@ -105,9 +105,9 @@ class XXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] ^= reg['Y']
-        return reg, set_flags(reg['X'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] ^= reg[Y]
+        return set_flags(reg[X])
 
 
 class BLA(BaseInstruction):
@@ -117,9 +117,9 @@ class BLA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'], flags = validate(reg['A'] << 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] << 1)
+        return flags
 
 
 class BLX(BaseInstruction):
@@ -129,9 +129,9 @@ class BLX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'], flags = validate(reg['X'] << 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X], flags = validate(reg[X] << 1)
+        return flags
 
 
 class BLY(BaseInstruction):
@@ -141,9 +141,9 @@ class BLY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'], flags = validate(reg['Y'] << 1)
-        return reg, flags
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y], flags = validate(reg[Y] << 1)
+        return flags
 
 
 class BRA(BaseInstruction):
@@ -153,9 +153,9 @@ class BRA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] = reg['A'] >> 1
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = reg[A] >> 1
+        return set_flags(reg[A])
 
 
 class BRX(BaseInstruction):
@@ -165,9 +165,9 @@ class BRX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] = reg['X'] >> 1
-        return reg, set_flags(reg['X'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] = reg[X] >> 1
+        return set_flags(reg[X])
 
 
 class BRY(BaseInstruction):
@@ -177,6 +177,6 @@ class BRY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'] = reg['Y'] >> 1
-        return reg, set_flags(reg['Y'])
\ No newline at end of file
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y] = reg[Y] >> 1
+        return set_flags(reg[Y])
\ No newline at end of file
@@ -1,5 +1,5 @@
-from .base import BaseInstruction, BLANK_FLAGS, set_flags
-from ..types import Flags, Registers, Data
+from .base import BaseInstruction, BLANK_FLAGS, ZERO_FLAGS, A, X, Y
+from ..types import Flags, Registers, Operands, Memory
 
 
 class EAX(BaseInstruction):
@@ -9,10 +9,8 @@ class EAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if reg['A'] != reg['X']:
-            return reg, BLANK_FLAGS
-        return reg, set_flags(0)
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        return ZERO_FLAGS if reg[A] == reg[X] else BLANK_FLAGS
 
 
 class EAY(BaseInstruction):
@@ -22,10 +20,8 @@ class EAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if reg['A'] != reg['Y']:
-            return reg, BLANK_FLAGS
-        return reg, set_flags(0)
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        return ZERO_FLAGS if reg[A] == reg[Y] else BLANK_FLAGS
 
 
 class EXY(BaseInstruction):
@@ -35,7 +31,5 @@ class EXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if reg['X'] != reg['Y']:
-            return reg, BLANK_FLAGS
-        return reg, set_flags(0)
\ No newline at end of file
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        return ZERO_FLAGS if reg[X] == reg[Y] else BLANK_FLAGS
\ No newline at end of file
@@ -1,5 +1,6 @@
-from .base import BaseInstruction, BLANK_FLAGS, HALT_FLAGS, data_to_memory_location
-from ..types import Flags, Registers, Data
+from .base import (BaseInstruction, BLANK_FLAGS, HALT_FLAGS, ZERO_FLAGS, OVERFLOW_FLAGS, NEGATIVE_FLAGS,
+                   data_to_memory_location, A, X, Y, PC)
+from ..types import Flags, Registers, Operands, Memory
 
 
 class HLT(BaseInstruction):
@@ -9,8 +10,8 @@ class HLT(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        return reg, HALT_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        return HALT_FLAGS
 
 
 class CLR(BaseInstruction):
@@ -20,9 +21,9 @@ class CLR(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] = reg['X'] = reg['Y'] = 0
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = reg[X] = reg[Y] = 0
+        return BLANK_FLAGS
 
 
 class NOP(BaseInstruction):
@@ -32,8 +33,8 @@ class NOP(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        return BLANK_FLAGS
 
 
 class JMP(BaseInstruction):
@@ -43,9 +44,9 @@ class JMP(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JNZ(BaseInstruction):
@@ -55,10 +56,10 @@ class JNZ(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['Z']:
-            reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & ZERO_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JMZ(BaseInstruction):
@@ -68,10 +69,10 @@ class JMZ(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['Z']:
-            reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & ZERO_FLAGS:
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JNN(BaseInstruction):
@@ -81,10 +82,10 @@ class JNN(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['N']:
-            reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & NEGATIVE_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JMN(BaseInstruction):
@@ -94,10 +95,10 @@ class JMN(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['N']:
-            reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & NEGATIVE_FLAGS:
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JNO(BaseInstruction):
@@ -107,10 +108,10 @@ class JNO(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['O']:
-            reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & OVERFLOW_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JMO(BaseInstruction):
@@ -120,10 +121,10 @@ class JMO(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['O']:
-            reg['PC'] = data_to_memory_location(data)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & OVERFLOW_FLAGS:
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
 
 
 class JFA(BaseInstruction):
@@ -133,9 +134,9 @@ class JFA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = (reg['PC'] + reg['A']) & (len(ram) - 1)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = (reg[PC] + reg[A]) & (len(ram) - 1)
+        return BLANK_FLAGS
 
 
 class JFX(BaseInstruction):
@@ -145,9 +146,9 @@ class JFX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = (reg['PC'] + reg['X']) & (len(ram) - 1)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = (reg[PC] + reg[X]) & (len(ram) - 1)
+        return BLANK_FLAGS
 
 
 class JFY(BaseInstruction):
@@ -157,9 +158,9 @@ class JFY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = (reg['PC'] + reg['Y']) & (len(ram) - 1)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = (reg[PC] + reg[Y]) & (len(ram) - 1)
+        return BLANK_FLAGS
     
 
 class JBA(BaseInstruction):
@@ -169,9 +170,9 @@ class JBA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = (reg['PC'] - reg['A']) & (len(ram) - 1)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = (reg[PC] - reg[A]) & (len(ram) - 1)
+        return BLANK_FLAGS
 
 
 class JBX(BaseInstruction):
@@ -181,9 +182,9 @@ class JBX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = (reg['PC'] - reg['X']) & (len(ram) - 1)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = (reg[PC] - reg[X]) & (len(ram) - 1)
+        return BLANK_FLAGS
 
 
 class JBY(BaseInstruction):
@@ -193,9 +194,9 @@ class JBY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['PC'] = (reg['PC'] - reg['Y']) & (len(ram) - 1)
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[PC] = (reg[PC] - reg[Y]) & (len(ram) - 1)
+        return BLANK_FLAGS
     
 
 class JAD(BaseInstruction):
@@ -206,12 +207,12 @@ class JAD(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
         low_byte = ram[location]
         high_byte = ram[(location + 1) & (len(ram) - 1)]
-        reg['PC'] = (high_byte << 8) | low_byte
-        return reg, BLANK_FLAGS
+        reg[PC] = (high_byte << 8) | low_byte
+        return BLANK_FLAGS
     
 
 class WPC(BaseInstruction):
@@ -221,13 +222,13 @@ class WPC(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        low_byte = reg['PC'] & 0xFF
-        high_byte = (reg['PC'] >> 8) & 0xFF
+        low_byte = reg[PC] & 0xFF
+        high_byte = (reg[PC] >> 8) & 0xFF
         ram[location] = low_byte
         ram[(location + 1) & (len(ram) - 1)] = high_byte
-        return reg, BLANK_FLAGS
+        return BLANK_FLAGS
     
 
 class RPC(BaseInstruction):
@@ -237,9 +238,9 @@ class RPC(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
         low_byte = ram[location]
         high_byte = ram[(location + 1) & (len(ram) - 1)]
-        reg['PC'] = (high_byte << 8) | low_byte
-        return reg, BLANK_FLAGS
\ No newline at end of file
+        reg[PC] = (high_byte << 8) | low_byte
+        return BLANK_FLAGS
\ No newline at end of file
@@ -1,5 +1,5 @@
-from .base import BaseInstruction, BLANK_FLAGS, set_flags
-from ..types import Flags, Registers, Data
+from .base import BaseInstruction, BLANK_FLAGS, ZERO_FLAGS, OVERFLOW_FLAGS, NEGATIVE_FLAGS, set_flags, A, X, Y
+from ..types import Flags, Registers, Operands, Memory
 
 
 class LDA(BaseInstruction):
@@ -9,9 +9,9 @@ class LDA(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 class LDX(BaseInstruction):
@@ -21,9 +21,9 @@ class LDX(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 class LDY(BaseInstruction):
@@ -33,9 +33,9 @@ class LDY(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y] = data[0]
+        return BLANK_FLAGS
 
 
 class CAX(BaseInstruction):
@@ -45,9 +45,9 @@ class CAX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] = reg['A']
-        return reg, set_flags(reg['X'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] = reg[A]
+        return set_flags(reg[X])
 
 
 class CAY(BaseInstruction):
@@ -57,9 +57,9 @@ class CAY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'] = reg['A']
-        return reg, set_flags(reg['Y'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y] = reg[A]
+        return set_flags(reg[Y])
 
 
 class CXY(BaseInstruction):
@@ -69,9 +69,9 @@ class CXY(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['Y'] = reg['X']
-        return reg, set_flags(reg['Y'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y] = reg[X]
+        return set_flags(reg[Y])
 
 
 class CYX(BaseInstruction):
@@ -81,9 +81,9 @@ class CYX(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['X'] = reg['Y']
-        return reg, set_flags(reg['X'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] = reg[Y]
+        return set_flags(reg[X])
 
 
 class CXA(BaseInstruction):
@@ -93,9 +93,9 @@ class CXA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] = reg['X']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = reg[X]
+        return set_flags(reg[A])
 
 
 class CYA(BaseInstruction):
@@ -105,9 +105,9 @@ class CYA(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        reg['A'] = reg['Y']
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = reg[Y]
+        return set_flags(reg[A])
     
 
 # A Register Conditional Loads
@@ -118,10 +118,10 @@ class CAZ(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['Z']:
-            reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & ZERO_FLAGS:
+            reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 class NAZ(BaseInstruction):
@@ -131,10 +131,10 @@ class NAZ(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['Z']:
-            reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & ZERO_FLAGS):
+            reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 class CAO(BaseInstruction):
@@ -144,10 +144,10 @@ class CAO(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['O']:
-            reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & OVERFLOW_FLAGS:
+            reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 class NAO(BaseInstruction):
@@ -157,10 +157,10 @@ class NAO(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['O']:
-            reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & OVERFLOW_FLAGS):
+            reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 class CAN(BaseInstruction):
@@ -170,10 +170,10 @@ class CAN(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['N']:
-            reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & NEGATIVE_FLAGS:
+            reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 class NAN(BaseInstruction):
@@ -183,10 +183,10 @@ class NAN(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['N']:
-            reg['A'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & NEGATIVE_FLAGS):
+            reg[A] = data[0]
+        return BLANK_FLAGS
 
 
 # X Register Conditional Loads
@@ -197,10 +197,10 @@ class CXZ(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['Z']:
-            reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & ZERO_FLAGS:
+            reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 class NXZ(BaseInstruction):
@@ -210,10 +210,10 @@ class NXZ(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['Z']:
-            reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & ZERO_FLAGS):
+            reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 class CXO(BaseInstruction):
@@ -223,10 +223,10 @@ class CXO(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['O']:
-            reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & OVERFLOW_FLAGS:
+            reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 class NXO(BaseInstruction):
@@ -236,10 +236,10 @@ class NXO(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['O']:
-            reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & OVERFLOW_FLAGS):
+            reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 class CXN(BaseInstruction):
@@ -249,10 +249,10 @@ class CXN(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['N']:
-            reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & NEGATIVE_FLAGS:
+            reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 class NXN(BaseInstruction):
@@ -262,10 +262,10 @@ class NXN(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['N']:
-            reg['X'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & NEGATIVE_FLAGS):
+            reg[X] = data[0]
+        return BLANK_FLAGS
 
 
 # Y Register Conditional Loads
@@ -276,10 +276,10 @@ class CYZ(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['Z']:
-            reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & ZERO_FLAGS:
+            reg[Y] = data[0]
+        return BLANK_FLAGS
 
 
 class NYZ(BaseInstruction):
@@ -289,10 +289,10 @@ class NYZ(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['Z']:
-            reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & ZERO_FLAGS):
+            reg[Y] = data[0]
+        return BLANK_FLAGS
 
 
 class CYO(BaseInstruction):
@@ -302,10 +302,10 @@ class CYO(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['O']:
-            reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & OVERFLOW_FLAGS:
+            reg[Y] = data[0]
+        return BLANK_FLAGS
 
 
 class NYO(BaseInstruction):
@@ -315,10 +315,10 @@ class NYO(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['O']:
-            reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & OVERFLOW_FLAGS):
+            reg[Y] = data[0]
+        return BLANK_FLAGS
 
 
 class CYN(BaseInstruction):
@@ -328,10 +328,10 @@ class CYN(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if flags['N']:
-            reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if flags & NEGATIVE_FLAGS:
+            reg[Y] = data[0]
+        return BLANK_FLAGS
 
 
 class NYN(BaseInstruction):
@@ -341,7 +341,7 @@ class NYN(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        if not flags['N']:
-            reg['Y'] = data[0]
-        return reg, BLANK_FLAGS
\ No newline at end of file
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        if not (flags & NEGATIVE_FLAGS):
+            reg[Y] = data[0]
+        return BLANK_FLAGS
\ No newline at end of file
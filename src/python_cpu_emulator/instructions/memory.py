@@ -1,5 +1,5 @@
-from .base import BaseInstruction, BLANK_FLAGS, ZERO_FLAGS, set_flags, data_to_memory_location
-from ..types import Flags, Registers, Data
+from .base import BaseInstruction, BLANK_FLAGS, ZERO_FLAGS, set_flags, data_to_memory_location, A, X, Y
+from ..types import Flags, Registers, Operands, Memory
 
 
 class WMA(BaseInstruction):
@@ -9,10 +9,10 @@ class WMA(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        ram[location] = reg['A']
-        return reg, BLANK_FLAGS
+        ram[location] = reg[A]
+        return BLANK_FLAGS
 
 
 class WMX(BaseInstruction):
@@ -22,10 +22,10 @@ class WMX(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        ram[location] = reg['X']
-        return reg, BLANK_FLAGS
+        ram[location] = reg[X]
+        return BLANK_FLAGS
 
 
 class WMY(BaseInstruction):
@@ -35,10 +35,10 @@ class WMY(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        ram[location] = reg['Y']
-        return reg, BLANK_FLAGS
+        ram[location] = reg[Y]
+        return BLANK_FLAGS
 
 
 class RMA(BaseInstruction):
@@ -48,10 +48,10 @@ class RMA(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        reg['A'] = ram[location]
-        return reg, BLANK_FLAGS
+        reg[A] = ram[location]
+        return BLANK_FLAGS
 
 
 class RMX(BaseInstruction):
@@ -61,10 +61,10 @@ class RMX(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        reg['X'] = ram[location]
-        return reg, BLANK_FLAGS
+        reg[X] = ram[location]
+        return BLANK_FLAGS
 
 
 class RMY(BaseInstruction):
@@ -74,10 +74,10 @@ class RMY(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         location = data_to_memory_location(data) & (len(ram) - 1)
-        reg['Y'] = ram[location]
-        return reg, BLANK_FLAGS
+        reg[Y] = ram[location]
+        return BLANK_FLAGS
 
 
 class RMI(BaseInstruction):
@@ -87,10 +87,10 @@ class RMI(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        location = (reg['Y'] * 256 + reg['X']) & (len(ram) - 1)
-        reg['A'] = ram[location]
-        return reg, set_flags(reg['A'])
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        location = (reg[Y] * 256 + reg[X]) & (len(ram) - 1)
+        reg[A] = ram[location]
+        return set_flags(reg[A])
 
 
 class WMI(BaseInstruction):
@@ -100,10 +100,10 @@ class WMI(BaseInstruction):
     length: int = 0
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        location = (reg['Y'] * 256 + reg['X']) & (len(ram) - 1)
-        ram[location] = reg['A']
-        return reg, BLANK_FLAGS
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        location = (reg[Y] * 256 + reg[X]) & (len(ram) - 1)
+        ram[location] = reg[A]
+        return BLANK_FLAGS
 
 
 class RMO(BaseInstruction):
@@ -113,11 +113,11 @@ class RMO(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         base_addr = data_to_memory_location(data)
-        location = (base_addr + reg['X']) & (len(ram) - 1)
-        reg['A'] = ram[location]
-        return reg, set_flags(reg['A'])
+        location = (base_addr + reg[X]) & (len(ram) - 1)
+        reg[A] = ram[location]
+        return set_flags(reg[A])
 
 
 class WMO(BaseInstruction):
@@ -127,11 +127,11 @@ class WMO(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
         base_addr = data_to_memory_location(data)
-        location = (base_addr + reg['X']) & (len(ram) - 1)
-        ram[location] = reg['A']
-        return reg, BLANK_FLAGS
+        location = (base_addr + reg[X]) & (len(ram) - 1)
+        ram[location] = reg[A]
+        return BLANK_FLAGS
     
 
 class FIL(BaseInstruction):
@@ -141,16 +141,16 @@ class FIL(BaseInstruction):
     length: int = 1
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        start_location = (reg['Y'] * 256 + reg['X']) & (len(ram) - 1)
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        start_location = (reg[Y] * 256 + reg[X]) & (len(ram) - 1)
         fill_value = data[0]
-        count = reg['A']
+        count = reg[A]
         
         for i in range(count):
             location = (start_location + i) & (len(ram) - 1)
             ram[location] = fill_value
             
-        return reg, BLANK_FLAGS
+        return BLANK_FLAGS
     
 
 class CMP(BaseInstruction):
@@ -160,20 +160,22 @@ class CMP(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        source_location = (reg['Y'] * 256 + reg['X']) & (len(ram) - 1)
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        source_location = (reg[Y] * 256 + reg[X]) & (len(ram) - 1)
         compare_location = data_to_memory_location(data) & (len(ram) - 1)
-        count = reg['A']
+        count = reg[A]
         
+        # Equal until a byte differs, breaking rather than returning so the kernel can inline this
+        flags = ZERO_FLAGS
         for i in range(count):
             source_addr = (source_location + i) & (len(ram) - 1)
             compare_addr = (compare_location + i) & (len(ram) - 1)
             
             if ram[source_addr] != ram[compare_addr]:
-                return reg, BLANK_FLAGS  # Not equal, Z flag remains false
+                flags = BLANK_FLAGS  # Not equal, Z flag remains false
+                break
         
-        # All bytes matched
-        return reg, ZERO_FLAGS  # Set Z flag to indicate equality
+        return flags
 
 
 class CPY(BaseInstruction):
@@ -183,14 +185,14 @@ class CPY(BaseInstruction):
     length: int = 2
 
     @staticmethod
-    def run(reg: Registers, flags: Flags, data: Data, ram: Data) -> tuple[Registers, Flags]:
-        source_location = (reg['Y'] * 256 + reg['X']) & (len(ram) - 1)
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        source_location = (reg[Y] * 256 + reg[X]) & (len(ram) - 1)
         dest_location = data_to_memory_location(data) & (len(ram) - 1)
-        count = reg['A']
+        count = reg[A]
         
         for i in range(count):
             source_addr = (source_location + i) & (len(ram) - 1)
             dest_addr = (dest_location + i) & (len(ram) - 1)
             ram[dest_addr] = ram[source_addr]
         
-        return reg, BLANK_FLAGS
\ No newline at end of file
+        return BLANK_FLAGS
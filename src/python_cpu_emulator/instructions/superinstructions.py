@@ -0,0 +1,181 @@
+from .base import BaseInstruction, BLANK_FLAGS, ZERO_FLAGS, OVERFLOW_FLAGS, set_flags, validate, data_to_memory_location, A, X, Y, PC
+from ..types import Flags, Registers, Operands, Memory
+
+
+class LWX(BaseInstruction):
+    """
+    Load, Write Indexed, Increment X - LDA, WMI and INX fused: writes the parameter to memory[X + Y*256] and increments X
+    """
+    length: int = 1
+    fuses: tuple[str, ...] = ('LDA', 'WMI', 'INX')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = data[0]
+        location = (reg[Y] * 256 + reg[X]) & (len(ram) - 1)
+        ram[location] = reg[A]
+        reg[X], flags = validate(reg[X] + 1)
+        return flags
+
+
+class IJX(BaseInstruction):
+    """
+    Increment X, Jump Not Overflow - INX and JNO fused: increments X and jumps to specified memory location unless it overflowed
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('INX', 'JNO')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X], flags = validate(reg[X] + 1)
+        if not (flags & OVERFLOW_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
+
+
+class CYR(BaseInstruction):
+    """
+    Copy A to Y, Read Memory A - CAY and RMA fused: copies A into Y then reads specified memory location into A
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('CAY', 'RMA')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y] = reg[A]
+        location = data_to_memory_location(data) & (len(ram) - 1)
+        reg[A] = ram[location]
+        return BLANK_FLAGS
+
+
+class RAX(BaseInstruction):
+    """
+    Read Memory A, Copy A to X - RMA and CAX fused: reads specified memory location into A and copies it into X
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('RMA', 'CAX')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        location = data_to_memory_location(data) & (len(ram) - 1)
+        reg[A] = reg[X] = ram[location]
+        return set_flags(reg[X])
+
+
+class XWA(BaseInstruction):
+    """
+    Copy X to A, Write Memory A - CXA and WMA fused: copies X into A and writes it to specified memory location
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('CXA', 'WMA')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = reg[X]
+        location = data_to_memory_location(data) & (len(ram) - 1)
+        ram[location] = reg[A]
+        return BLANK_FLAGS
+
+
+class YWA(BaseInstruction):
+    """
+    Copy Y to A, Write Memory A - CYA and WMA fused: copies Y into A and writes it to specified memory location
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('CYA', 'WMA')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = reg[Y]
+        location = data_to_memory_location(data) & (len(ram) - 1)
+        ram[location] = reg[A]
+        return BLANK_FLAGS
+
+
+class LWA(BaseInstruction):
+    """
+    Load, Write Memory A - LDA and WMA fused: loads A with the first parameter and writes it to the memory location given by the second
+    """
+    length: int = 3
+    fuses: tuple[str, ...] = ('LDA', 'WMA')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = data[0]
+        location = ((data[1] << 8) + data[2]) & (len(ram) - 1)
+        ram[location] = reg[A]
+        return BLANK_FLAGS
+
+
+class IZA(BaseInstruction):
+    """
+    Increment A, Jump Not Zero - INA and JNZ fused: increments A and jumps to specified memory location unless the result was zero
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('INA', 'JNZ')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] + 1)
+        if not (flags & ZERO_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
+
+
+class CLL(BaseInstruction):
+    """
+    Clear, Load A, Load X - CLR, LDA and LDX fused: clears Y and loads A and X with the two parameters
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('CLR', 'LDA', 'LDX')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A] = data[0]
+        reg[X] = data[1]
+        reg[Y] = 0
+        return BLANK_FLAGS
+
+
+class IJA(BaseInstruction):
+    """
+    Increment A, Jump Not Overflow - INA and JNO fused: increments A and jumps to specified memory location unless it overflowed
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('INA', 'JNO')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[A], flags = validate(reg[A] + 1)
+        if not (flags & OVERFLOW_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
+
+
+class IJY(BaseInstruction):
+    """
+    Increment Y, Jump Not Overflow - INY and JNO fused: increments Y and jumps to specified memory location unless it overflowed
+    """
+    length: int = 2
+    fuses: tuple[str, ...] = ('INY', 'JNO')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[Y], flags = validate(reg[Y] + 1)
+        if not (flags & OVERFLOW_FLAGS):
+            reg[PC] = data_to_memory_location(data)
+        return BLANK_FLAGS
+
+
+class LSA(BaseInstruction):
+    """
+    Load X, Subtract A and X - LDX and SAX fused: loads X with the parameter and subtracts it from A
+    """
+    length: int = 1
+    fuses: tuple[str, ...] = ('LDX', 'SAX')
+
+    @staticmethod
+    def run(reg: Registers, flags: Flags, data: Operands, ram: Memory) -> Flags:
+        reg[X] = data[0]
+        reg[A], flags = validate(reg[A] - reg[X])
+        return flags
@@ -0,0 +1,508 @@
+"""
+Generated execution kernel.
+
+The bodies of the instructions' run() methods are inlined into one function at
+import time, so the hot loop keeps the registers in locals and dispatches with
+a handful of integer comparisons instead of a Python call per tick. The
+instruction classes remain the only definition of what each opcode does; any
+body the inliner can't flatten is called through its handler instead. Calls to
+validate() and set_flags() whose argument range is known from the registers
+and operands become FLAG_TABLE lookups, so most opcodes execute no call at all.
+"""
+import ast
+import functools
+import inspect
+import re
+import sys
+import textwrap
+from collections.abc import Sequence
+from .instructions import InstructionList, InstructionSet, Handlers, Lengths, MAX_LENGTH
+from .instructions.base import BYTE_SIZE, validate
+from .types import Memory
+from .utils import HALT_FLAGS, set_flags
+
+
+REGISTER_LOCALS = ('a', 'x', 'y', 'pc')  # kernel locals for reg[A], reg[X], reg[Y] and reg[PC]
+RESERVED = {'cpu', 'limit', 'counts', 'ram', 'mask', 'reg', 'data', 'ticks', 'op', 'FLAG_TABLE', *REGISTER_LOCALS,
+            *(f'd{i}' for i in range(MAX_LENGTH))}
+
+# set_flags() for every value in [-FLAG_RANGE, FLAG_RANGE), negative values indexing from the end
+FLAG_RANGE = 2 * BYTE_SIZE
+FLAG_TABLE: tuple[int, ...] = tuple(set_flags(value) for value in (*range(FLAG_RANGE), *range(-FLAG_RANGE, 0)))
+
+
+def _bounds(node: ast.AST) -> tuple[int, int] | None:
+    """Returns the range of values an inlined expression can take, or None if it isn't known"""
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value, node.value
+    if isinstance(node, ast.Name) and (node.id in ('a', 'x', 'y') or re.fullmatch(r'd\d+', node.id)):
+        return 0, BYTE_SIZE - 1
+    if isinstance(node, ast.BinOp):
+        left, right = _bounds(node.left), _bounds(node.right)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            return left[0] + right[0], left[1] + right[1]
+        if isinstance(node.op, ast.Sub):
+            return left[0] - right[1], left[1] - right[0]
+        if isinstance(node.op, ast.LShift) and right[0] == right[1] and 0 <= right[0] <= 8:
+            return left[0] << right[0], left[1] << right[0]
+    return None
+
+
+class _Inliner(ast.NodeTransformer):
+    """Rewrites a run() body in terms of the kernel's locals, clearing ok if it can't"""
+    def __init__(self, namespace: dict, length: int) -> None:
+        self.namespace = namespace
+        self.length = length
+        self.globals: dict = {}
+        self.loops = 0
+        self.ok = True
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        if isinstance(node.value, ast.Name):
+            if node.value.id == 'reg' and isinstance(node.slice, ast.Name):
+                index = self.namespace.get(node.slice.id)
+                if isinstance(index, int) and 0 <= index < len(REGISTER_LOCALS):
+                    return ast.Name(REGISTER_LOCALS[index], node.ctx)
+            if node.value.id == 'data' and isinstance(node.slice, ast.Constant):
+                if isinstance(node.slice.value, int) and 0 <= node.slice.value < self.length:
+                    return ast.Name(f'd{node.slice.value}', node.ctx)
+        return self.generic_visit(node)
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        # len(ram) - 1 is the address mask
+        if (isinstance(node.op, ast.Sub) and self._is_len_ram(node.left)
+                and isinstance(node.right, ast.Constant) and node.right.value == 1):
+            return ast.Name('mask', ast.Load())
+        return self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> ast.AST | list[ast.stmt]:
+        # target, flags = validate(value) -> flags = FLAG_TABLE[value]; target = value & 255
+        call = node.value
+        if (len(node.targets) == 1 and isinstance(node.targets[0], ast.Tuple) and len(node.targets[0].elts) == 2
+                and isinstance(call, ast.Call) and self._calls(call, validate) and len(call.args) == 1):
+            target, flags = node.targets[0].elts
+            if isinstance(flags, ast.Name) and flags.id == 'flags':
+                target, value = self.visit(target), self.visit(call.args[0])
+                lookup = self._flag_lookup(value)
+                if lookup is not None and not (isinstance(target, ast.Name) and target.id == 'flags'):
+                    masked = ast.BinOp(value, ast.BitAnd(), ast.Constant(BYTE_SIZE - 1))
+                    return [ast.Assign([ast.Name('flags', ast.Store())], lookup), ast.Assign([target], masked)]
+        return self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if self._calls(node, set_flags) and len(node.args) == 1:
+            lookup = self._flag_lookup(self.visit(node.args[0]))
+            if lookup is not None:
+                return lookup
+        if self._is_len_ram(node):
+            return ast.BinOp(ast.Name('mask', ast.Load()), ast.Add(), ast.Constant(1))
+        if (isinstance(node.func, ast.Name) and node.func.id == 'data_to_memory_location'
+                and len(node.args) == 1 and isinstance(node.args[0], ast.Name)
+                and node.args[0].id == 'data' and self.length == 2):
+            high = ast.BinOp(ast.Name('d0', ast.Load()), ast.LShift(), ast.Constant(8))
+            return ast.BinOp(high, ast.Add(), ast.Name('d1', ast.Load()))
+        return self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in ('reg', 'data') or (isinstance(node.ctx, ast.Store) and node.id in RESERVED):
+            self.ok = False
+        elif isinstance(node.ctx, ast.Load) and node.id in self.namespace:
+            value = self.namespace[node.id]
+            if isinstance(value, int):
+                return ast.Constant(value)
+            if self.globals.setdefault(node.id, value) is not value:
+                self.ok = False
+        return node
+
+    def visit_For(self, node: ast.For | ast.While) -> ast.AST:
+        self.loops += 1
+        node = self.generic_visit(node)
+        self.loops -= 1
+        return node
+
+    visit_While = visit_For
+
+    def visit_Break(self, node: ast.Break | ast.Continue) -> ast.AST:
+        # Outside a loop of its own this would act on the kernel's loop
+        if not self.loops:
+            self.ok = False
+        return node
+
+    visit_Continue = visit_Break
+
+    def visit_Nonlocal(self, node: ast.AST) -> ast.AST:
+        self.ok = False
+        return node
+
+    visit_Global = visit_Nonlocal
+    visit_Lambda = visit_Nonlocal
+    visit_FunctionDef = visit_Nonlocal
+
+    def _calls(self, node: ast.Call, function) -> bool:
+        return isinstance(node.func, ast.Name) and self.namespace.get(node.func.id) is function
+
+    @staticmethod
+    def _flag_lookup(value: ast.AST) -> ast.AST | None:
+        """Returns set_flags(value) as a constant or FLAG_TABLE lookup if value's range allows it"""
+        bounds = _bounds(value)
+        if bounds is None or bounds[0] < -FLAG_RANGE or bounds[1] >= FLAG_RANGE:
+            return None
+        if bounds[0] == bounds[1]:
+            return ast.Constant(set_flags(bounds[0]))
+        return ast.Subscript(ast.Name('FLAG_TABLE', ast.Load()), value, ast.Load())
+
+    @staticmethod
+    def _is_len_ram(node: ast.AST) -> bool:
+        return (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'len'
+                and len(node.args) == 1 and isinstance(node.args[0], ast.Name) and node.args[0].id == 'ram')
+
+
+def _lower(body: list[ast.stmt]) -> tuple[list[ast.stmt], bool] | None:
+    """
+    Replaces every `return value` with `flags = value`, moving the statements that follow an
+    if-statement which returns into its else branch. Returns the new body and whether it always
+    returns, or None if a return can't be removed this way (e.g. one inside a loop).
+    """
+    lowered: list[ast.stmt] = []
+    for index, statement in enumerate(body):
+        if isinstance(statement, ast.Return):
+            if statement.value is None:
+                return None
+            lowered.append(ast.Assign([ast.Name('flags', ast.Store())], statement.value))
+            return lowered, True
+        if isinstance(statement, ast.If):
+            then, orelse = _lower(statement.body), _lower(statement.orelse)
+            if then is None or orelse is None:
+                return None
+            if then[1] or orelse[1]:
+                rest = _lower(body[index + 1:])
+                if rest is None:
+                    return None
+                # Whichever branch falls through continues with the rest of the body
+                then_body = then[0] if then[1] else then[0] + rest[0]
+                else_body = orelse[0] if orelse[1] else orelse[0] + rest[0]
+                lowered.append(ast.If(statement.test, then_body or [ast.Pass()], else_body))
+                return lowered, (then[1] or rest[1]) and (orelse[1] or rest[1])
+            lowered.append(ast.If(statement.test, then[0] or [ast.Pass()], orelse[0]))
+            continue
+        if any(isinstance(node, ast.Return) for node in ast.walk(statement)):
+            return None
+        lowered.append(statement)
+    return lowered, False
+
+
+def _inline(instruction: type, length: int) -> tuple[list[str], dict] | None:
+    """Returns the inlined source lines of an instruction's run() and the globals they use"""
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(instruction.run)))
+    except (OSError, TypeError, SyntaxError):
+        return None
+    function = tree.body[0]
+    if not isinstance(function, ast.FunctionDef):
+        return None
+    lowered = _lower(function.body)
+    if lowered is None or not lowered[1]:
+        return None
+    inliner = _Inliner(sys.modules[instruction.__module__].__dict__, length)
+    body = inliner.visit(ast.Module(lowered[0], [])).body
+    if not inliner.ok:
+        return None
+    return ast.unparse(ast.fix_missing_locations(ast.Module(body, []))).splitlines(), inliner.globals
+
+
+def _body(opcode: int, namespace: dict) -> list[str]:
+    """Returns the lines that execute one opcode once its operands are in d0, d1, ... and pc is advanced"""
+    instruction = InstructionList[opcode]
+    length = Lengths[opcode]
+    inlined = _inline(instruction, length)
+    if inlined is not None:
+        lines, used = inlined
+        namespace.update(used)
+        if lines[-1] == 'flags = flags':
+            lines.pop()
+        return lines
+    # Fall back to calling the handler with the register file in sync
+    handler = f'_{instruction.__name__}'
+    namespace[handler] = Handlers[opcode]
+    data = f"({', '.join(f'd{i}' for i in range(length))}{',' if length == 1 else ''})"
+    return ['reg[:] = a, x, y, pc',
+            f'flags = {handler}(reg, flags, {data}, ram)',
+            'a, x, y, pc = reg']
+
+
+def _leaf(opcode: int, namespace: dict) -> list[str]:
+    """Returns the kernel lines that fetch the operands of, and execute, one opcode"""
+    length = Lengths[opcode]
+    lines = _body(opcode, namespace)
+    source = '\n'.join(lines)
+    operands = [f'd{i} = ram[(pc + {i + 1}) & mask]' for i in range(length) if re.search(rf'\bd{i}\b', source)]
+    advance = f'pc = (pc + {length + 1}) & mask'
+    if _may_halt(lines):
+        lines += [f'if flags & {HALT_FLAGS}:', '    break']
+    return operands + [advance] + lines
+
+
+def _may_halt(lines: list[str]) -> bool:
+    """Returns whether lines can set the halt flag, i.e. store anything but known non-halting flags"""
+    def safe(value: ast.AST) -> bool:
+        if isinstance(value, ast.IfExp):
+            return safe(value.body) and safe(value.orelse)
+        return ((isinstance(value, ast.Constant) and type(value.value) is int and not value.value & HALT_FLAGS)
+                or (isinstance(value, ast.Name) and value.id == 'flags')
+                or (isinstance(value, ast.Subscript) and isinstance(value.value, ast.Name)
+                    and value.value.id == 'FLAG_TABLE'))
+
+    tree = ast.parse('\n'.join(lines))
+    stores = safe_stores = 0
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id == 'flags' and not isinstance(node.ctx, ast.Load):
+            stores += 1
+        elif (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id == 'flags' and safe(node.value)):
+            safe_stores += 1
+    return stores != safe_stores
+
+
+def _dispatch(segments: list[tuple[int, list[str], int]]) -> list[str]:
+    """
+    Builds an if/else tree over (first opcode, lines, weight) segments sorted by opcode, splitting
+    where the weights either side are closest to equal so heavier segments sit nearer the root
+    """
+    if len(segments) == 1:
+        return segments[0][1]
+    total = sum(weight for _, _, weight in segments)
+    middle, left, best = 1, 0, None
+    for index in range(1, len(segments)):
+        left += segments[index - 1][2]
+        imbalance = abs(total - 2 * left)
+        if best is None or imbalance < best:
+            middle, best = index, imbalance
+    lines = [f'if op < {segments[middle][0]}:']
+    lines += ['    ' + line for line in _dispatch(segments[:middle])]
+    lines += ['else:']
+    lines += ['    ' + line for line in _dispatch(segments[middle:])]
+    return lines
+
+
+def build_kernel(weights: Sequence[int] | None = None, counting: bool = False):
+    """
+    Generates and compiles the kernel from the current instruction set. weights, e.g. a profile of
+    how often each opcode executes, shape the dispatch tree; without them it is balanced. A counting
+    kernel takes a third argument, a list of 256 counters, and adds one to an opcode's per execution.
+    """
+    namespace: dict = {'FLAG_TABLE': FLAG_TABLE}
+    segments: list[tuple[int, list[str], int]] = []
+    for opcode, instruction in enumerate(InstructionList):
+        # Unassigned opcodes share one segment with whatever instruction they decode as
+        weight = 1 + (weights[opcode] if weights else 0)
+        if segments and opcode not in InstructionSet and InstructionList[opcode - 1] is instruction:
+            first, lines, shared = segments[-1]
+            segments[-1] = (first, lines, shared + weight - 1)
+            continue
+        segments.append((opcode, _leaf(opcode, namespace), weight))
+    body = '\n'.join('            ' + line for line in _dispatch(segments))
+    # Globals the inlined bodies use are bound as keyword-only defaults, making them fast locals
+    bound = ''.join(f', {name}={name}' for name in sorted(namespace))
+    count = '\n            counts[op] += 1' if counting else ''
+    source = f'''
+def kernel(cpu, limit{', counts' if counting else ''}, *{bound}):
+    ram = cpu.RAM
+    mask = len(ram) - 1
+    reg = cpu.REG
+    a, x, y, pc = reg
+    flags = cpu.FLAGS
+    ticks = cpu.TICKS
+    if flags & {HALT_FLAGS}:
+        return
+    try:
+        # ticks counts the instruction being executed; opcodes that can halt leave the loop themselves
+        for ticks in range(ticks + 1, limit + 1):
+            op = ram[pc]{count}
+{body}
+    finally:
+        cpu.REG[:] = a, x, y, pc
+        cpu.FLAGS = flags
+        cpu.TICKS = ticks
+'''
+    exec(compile(source, '<kernel>', 'exec'), namespace)
+    kernel = namespace['kernel']
+    code = kernel.__code__
+    shadowed = set(code.co_varnames[code.co_argcount + code.co_kwonlyargcount:]) & namespace.keys()
+    if shadowed:
+        raise RuntimeError(f"Inlined instruction locals shadow globals: {sorted(shadowed)}")
+    kernel.source = source
+    return kernel
+
+
+MAX_BLOCK = 64  # most instructions translated into one block
+HOT_BLOCK = 16  # entries into a block before it is translated
+
+
+class _Specializer(ast.NodeTransformer):
+    """
+    Specializes an opcode's body to one address: its operands and the address mask become constants,
+    and RAM stores that may land inside the block's own code set _rewritten
+    """
+    def __init__(self, values: dict[str, int], start: int, end: int) -> None:
+        self.values = values
+        self.start = start
+        self.end = end
+        self.checked = False
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if isinstance(node.ctx, ast.Load) and node.id in self.values:
+            return ast.Constant(self.values[node.id])
+        return node
+
+    def visit_Assign(self, node: ast.Assign) -> ast.AST | list[ast.stmt]:
+        node = self.generic_visit(node)
+        target = node.targets[0]
+        if not (len(node.targets) == 1 and isinstance(target, ast.Subscript)
+                and isinstance(target.value, ast.Name) and target.value.id == 'ram'):
+            return node
+        try:
+            address = eval(compile(ast.fix_missing_locations(ast.Expression(target.slice)), '<address>', 'eval'), {})
+        except NameError:
+            address = None
+        if address is not None and not self.start <= address < self.end:
+            return node
+        self.checked = True
+        store = ast.Subscript(ast.Name('ram', ast.Load()), ast.Name('_address', ast.Load()), ast.Store())
+        inside = ast.Compare(ast.Constant(self.start), [ast.LtE(), ast.Lt()],
+                             [ast.Name('_address', ast.Load()), ast.Constant(self.end)])
+        return [ast.Assign([ast.Name('_address', ast.Store())], target.slice),
+                ast.Assign([store], node.value),
+                ast.If(inside, [ast.Assign([ast.Name('_rewritten', ast.Store())], ast.Constant(True))], [])]
+
+
+@functools.cache
+def _block_body(opcode: int) -> tuple[ast.Module, bool, bool]:
+    """Returns an opcode's body, whether it can be translated and whether it must end a block"""
+    namespace = _BLOCK_NAMESPACE
+    tree = ast.parse('\n'.join(_body(opcode, namespace)))
+    names = [node for node in ast.walk(tree) if isinstance(node, ast.Name)]
+    usable = not any(node.id in ('reg', '_address', '_rewritten') for node in names)
+    jumps = any(node.id == 'pc' and not isinstance(node.ctx, ast.Load) for node in names)
+    loops = any(isinstance(node, (ast.For, ast.While)) for node in ast.walk(tree))
+    return tree, usable, jumps or loops or _may_halt(ast.unparse(tree).splitlines())
+
+
+_BLOCK_NAMESPACE: dict = {'FLAG_TABLE': FLAG_TABLE}
+
+
+def translate(ram: Memory, start: int):
+    """
+    Translates the basic block of code at start into a function run(a, x, y, flags, ram, budget)
+    that returns (a, x, y, pc, flags, instructions executed). A block that jumps back to its own
+    start keeps looping inside the function while it has budget left. Returns the block's end
+    address, its code, run and its length in instructions, or None if its first instruction can't
+    be translated.
+    """
+    mask = len(ram) - 1
+    decoded: list[tuple[int, int, bytes]] = []
+    pc = start
+    while len(decoded) < MAX_BLOCK:
+        opcode = ram[pc]
+        length = Lengths[opcode]
+        if pc + length > mask or not _block_body(opcode)[1]:
+            break
+        decoded.append((pc, opcode, bytes(ram[pc + 1:pc + 1 + length])))
+        pc += length + 1
+        if _block_body(opcode)[2]:
+            break
+    if not decoded:
+        return None
+    end = pc
+    size = len(decoded)
+    lines: list[str] = []
+    checked = loops = False
+    for count, (address, opcode, operands) in enumerate(decoded, 1):
+        after = (address + len(operands) + 1) & mask
+        tree, _, terminates = _block_body(opcode)
+        values = {'mask': mask, **{f'd{i}': value for i, value in enumerate(operands)}}
+        specializer = _Specializer(values, start, end)
+        body = ast.fix_missing_locations(specializer.visit(ast.parse(ast.unparse(tree))))
+        checked = checked or specializer.checked
+        if terminates or any(isinstance(node, ast.Name) and node.id == 'pc' for node in ast.walk(tree)):
+            lines.append(f'pc = {after}')
+        lines += ast.unparse(body).splitlines()
+        if count < size and specializer.checked:
+            lines += ['if _rewritten:', f'    return a, x, y, {after}, flags, executed + {count}']
+        if count == size:
+            if not terminates:
+                lines.append(f'pc = {after}')
+            loops = any(isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant)
+                        and node.value.value == start and isinstance(node.targets[0], ast.Name)
+                        and node.targets[0].id == 'pc' for node in ast.walk(body))
+    if loops:
+        # Stop when the block leaves, may have rewritten itself or another pass would exceed the budget
+        leave = f"{'_rewritten or ' if checked else ''}pc != {start} or executed + {size} > budget"
+        lines = (['while True:'] + ['    ' + line for line in lines]
+                 + [f'    executed += {size}', f'    if {leave}:', '        return a, x, y, pc, flags, executed'])
+    else:
+        lines.append(f'return a, x, y, pc, flags, {size}')
+    prologue = ['executed = 0'] + (['_rewritten = False'] if checked else [])
+    bound = ''.join(f', {name}={name}' for name in sorted(_BLOCK_NAMESPACE))
+    source = f'def run(a, x, y, flags, ram, budget, *{bound}):\n' + '\n'.join('    ' + line for line in prologue + lines)
+    namespace = dict(_BLOCK_NAMESPACE)
+    exec(compile(source, f'<block {start:04X}>', 'exec'), namespace)
+    run = namespace['run']
+    run.source = source
+    return end, bytes(ram[start:end]), run, size
+
+
+def block_kernel(cpu, limit):
+    """
+    Runs like kernel() but executes each basic block entered HOT_BLOCK times through a translation
+    cached in cpu.BLOCKS, re-translating a block whenever its code in RAM has changed. Code that is
+    still cold, or can't be translated, is single-stepped through kernel().
+    """
+    ram = cpu.RAM
+    blocks = cpu.BLOCKS
+    a, x, y, pc = cpu.REG
+    flags = cpu.FLAGS
+    ticks = cpu.TICKS
+    try:
+        while ticks < limit and not flags & HALT_FLAGS:
+            block = blocks.get(pc, 0)
+            if block.__class__ is int:
+                if block + 1 < HOT_BLOCK:
+                    blocks[pc] = block + 1
+                    block = None
+                else:
+                    block = blocks[pc] = translate(ram, pc) or (pc + 1, bytes(ram[pc:pc + 1]), None, 1)
+            elif ram[pc:block[0]] != block[1]:
+                block = blocks[pc] = translate(ram, pc) or (pc + 1, bytes(ram[pc:pc + 1]), None, 1)
+            if block is None or block[2] is None or ticks + block[3] > limit:
+                cpu.REG[:] = a, x, y, pc
+                cpu.FLAGS = flags
+                cpu.TICKS = ticks
+                kernel(cpu, ticks + 1)
+                a, x, y, pc = cpu.REG
+                flags = cpu.FLAGS
+                ticks = cpu.TICKS
+                continue
+            a, x, y, pc, flags, count = block[2](a, x, y, flags, ram, limit - ticks)
+            ticks += count
+    finally:
+        cpu.REG[:] = a, x, y, pc
+        cpu.FLAGS = flags
+        cpu.TICKS = ticks
+
+
+@functools.cache
+def counting_kernel():
+    """Returns the kernel that also counts executed opcodes: kernel(cpu, limit, counts)"""
+    return build_kernel(counting=True)
+
+
+@functools.lru_cache(maxsize=16)
+def specialized_kernel(weights: tuple[int, ...]):
+    """Returns a kernel whose dispatch is shaped by weights, reusing it for an identical profile"""
+    return build_kernel(weights)
+
+
+# Runs a CPU until its tick counter reaches limit or it halts: kernel(cpu, limit)
+kernel = build_kernel()
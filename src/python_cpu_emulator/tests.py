@@ -18,10 +18,12 @@ sys.path.insert(0, current_dir)
 
 try:
     from python_cpu_emulator.cpu import CPU
+    from python_cpu_emulator.compiler import AdvancedCompiler, CompilerError
+    from python_cpu_emulator.jit import kernel, block_kernel
     from python_cpu_emulator.instructions.base import BaseInstruction
-    from python_cpu_emulator.instructions import NameToOpcode
-    from python_cpu_emulator.types import Flags, Registers, Data
-    from python_cpu_emulator.utils import BLANK_FLAGS
+    from python_cpu_emulator.instructions import NameToOpcode, OpcodeToName
+    from python_cpu_emulator.types import Data
+    from python_cpu_emulator.utils import BLANK_FLAGS, FLAG_BITS, REGISTER_NAMES, flags_to_dict, registers_to_dict
 except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
@@ -30,8 +32,8 @@ except ImportError as e:
 @dataclass
 class TestState:
     """Complete CPU state for testing"""
-    registers: Registers = field(default_factory=lambda: {'A': 0, 'X': 0, 'Y': 0, 'PC': 0})
-    flags: Flags = field(default_factory=lambda: BLANK_FLAGS.copy())
+    registers: Dict[str, int] = field(default_factory=lambda: {'A': 0, 'X': 0, 'Y': 0, 'PC': 0})
+    flags: Dict[str, bool] = field(default_factory=lambda: flags_to_dict(BLANK_FLAGS))
     ram: Data = field(default_factory=lambda: [0] * 1024)
     data: Data = field(default_factory=list)
 
@@ -246,9 +248,9 @@ def states_equal(state1: TestState, state2: TestState, ignore_pc: bool = False,
 def extract_cpu_state(cpu: CPU) -> TestState:
     """Extract current state from CPU instance"""
     return TestState(
-        registers=cpu.REG.copy(),
-        flags=cpu.FLAGS.copy(),
-        ram=cpu.RAM.copy(),
+        registers=registers_to_dict(cpu.REG),
+        flags=flags_to_dict(cpu.FLAGS),
+        ram=list(cpu.RAM),
         data=[]
     )
 
@@ -273,8 +275,8 @@ def setup_cpu_for_instruction(instruction_class: type[BaseInstruction], initial_
     cpu.load_data(instruction_bytes, offset=pc_location)
     
     # Set up initial CPU state
-    cpu.REG = initial_state.registers.copy()
-    cpu.FLAGS = initial_state.flags.copy()
+    cpu.REG = [initial_state.registers[name] for name in REGISTER_NAMES]
+    cpu.FLAGS = sum(bit for name, bit in FLAG_BITS.items() if initial_state.flags[name])
     
     # Apply initial RAM state (preserve instruction bytes)
     for i, value in enumerate(initial_state.ram):
@@ -397,13 +399,158 @@ def quick_test(instruction_class: type[BaseInstruction], **kwargs) -> bool:
     return test_instruction(instruction_class, initial, expected, **test_params)
 
 
+def test_unassigned_opcode() -> bool:
+    """Opcodes with no instruction assigned decode as HLT"""
+    unassigned = next(opcode for opcode in range(256) if opcode not in OpcodeToName)
+    cpu = CPU(ram_size=4)
+    cpu.load_data([unassigned])
+    cpu.tick()
+    return cpu.halted and cpu.TICKS == 1 and registers_to_dict(cpu.REG)['PC'] == 1
+
+
+def test_specialized_kernel() -> bool:
+    """A CPU specialized to its program's opcode profile ends in the same state as one that isn't"""
+    # Store an incrementing A at memory[512 + X] until X overflows
+    program = [NameToOpcode['RMA'], 0, 100, NameToOpcode['INA'], NameToOpcode['WMO'], 2, 0,
+               NameToOpcode['INX'], NameToOpcode['JNO'], 0, 3, NameToOpcode['HLT']]
+    cpus = [CPU(ram_size=4), CPU(ram_size=4)]
+    for cpu in cpus:
+        cpu.load_data(program)
+    cpus[1].specialize(ticks=500)
+    for cpu in cpus:
+        while not cpu.halted:
+            cpu.tick()
+    return str(cpus[0]) == str(cpus[1]) and cpus[0].RAM == cpus[1].RAM and cpus[1].KERNEL is not cpus[0].KERNEL
+
+
+def test_block_kernel() -> bool:
+    """The block-translating kernel ends in the same state as the plain kernel, including on code that rewrites itself"""
+    programs = [
+        # Store an incrementing A at memory[512 + X] until X overflows
+        [NameToOpcode['RMA'], 0, 100, NameToOpcode['INA'], NameToOpcode['WMO'], 2, 0,
+         NameToOpcode['INX'], NameToOpcode['JNO'], 0, 3, NameToOpcode['HLT']],
+        # Each pass writes X over the target of its own JNO
+        [NameToOpcode['INX'], NameToOpcode['CXA'], NameToOpcode['WMA'], 0, 8,
+         NameToOpcode['JNO'], 0, 0, NameToOpcode['HLT']],
+    ]
+    for program in programs:
+        cpus = [CPU(ram_size=4), CPU(ram_size=4)]
+        for cpu in cpus:
+            cpu.load_data(program)
+        kernel(cpus[0], 5000)
+        block_kernel(cpus[1], 5000)
+        if str(cpus[0]) != str(cpus[1]) or cpus[0].RAM != cpus[1].RAM or not cpus[1].BLOCKS:
+            return False
+    return True
+
+
+def test_compile_superinstructions() -> bool:
+    """Superinstructions written in source take one operand per instruction they fuse"""
+    compiler = AdvancedCompiler()
+    return (compiler.compile_source("CLL 1 2") == bytes([NameToOpcode['CLL'], 1, 2]) and
+            compiler.compile_source("LWA 42 $1000") == bytes([NameToOpcode['LWA'], 42, 0x10, 0x00]) and
+            compiler.compile_source("CONST BASE $1000\nLWA 6 * 7 BASE + 1") == bytes([NameToOpcode['LWA'], 42, 0x10, 0x01]))
+
+
+def test_compile_label_addresses() -> bool:
+    """Labels resolve to the byte address of their instruction rather than its index, and stay out of constants"""
+    compiler = AdvancedCompiler()
+    # END is instruction 3 but byte 8, TOP is instruction 2 but byte 5
+    forward = compiler.compile_source("LDA 5\nWMA $2000\nJMP END\n:END\nHLT")
+    backward = compiler.compile_source("LDA 5\nWMA $2000\n:TOP\nINX\nJNO TOP\nHLT")
+    if forward[5:8] != bytes([NameToOpcode['JMP'], 0, 8]) or backward[6:9] != bytes([NameToOpcode['JNO'], 0, 5]):
+        return False
+    # A label has no address until code generation, so a constant can't be built from one
+    try:
+        compiler.compile_source(":END\nHLT\nCONST X END + 1")
+    except CompilerError:
+        return True
+    return False
+
+
+def test_compile_optimize() -> bool:
+    """Fusing leaves a program's behaviour unchanged, relocates later labels and never fuses across a label"""
+    plain, optimizing = AdvancedCompiler(), AdvancedCompiler(optimize=True)
+    cases = [
+        # INX/JNO closing the loop becomes IJX
+        (":TOP\nCXA\nWMO $0200\nINX\nJNO TOP\nHLT", 'IJX', 4),
+        # MID sits inside the INX/JNO window, so nothing is fused
+        (":TOP\nCXA\nWMO $0200\nINX\n:MID\nJNO TOP\nHLT", None, None),
+        # LDA/WMA becomes LWA, one byte shorter, so END moves back by one
+        ("LDA 42\nWMA $0200\nJMP END\nLDA 1\n:END\nLDX 7\nCXA\nWMA $0201\nHLT", 'LWA', 0),
+    ]
+    for source, fused, address in cases:
+        unfused_code, fused_code = plain.compile_source(source), optimizing.compile_source(source)
+        if fused is None:
+            if fused_code != unfused_code:
+                return False
+        elif fused_code[address] != NameToOpcode[fused]:
+            return False
+        # Both builds must end with the same registers and the same data written from $0200
+        cpus = []
+        for code in (unfused_code, fused_code):
+            cpu = CPU(ram_size=4)
+            cpu.load_data(list(code))
+            kernel(cpu, 5000)
+            cpus.append(cpu)
+        if not all(cpu.halted for cpu in cpus) or cpus[0].REG[:3] != cpus[1].REG[:3] or cpus[0].RAM[512:768] != cpus[1].RAM[512:768]:
+            return False
+    # The JMP after LWA targets END, one byte earlier than in the unfused build
+    unfused_code, fused_code = plain.compile_source(cases[2][0]), optimizing.compile_source(cases[2][0])
+    return unfused_code[5:8] == bytes([NameToOpcode['JMP'], 0, 10]) and fused_code[4:7] == bytes([NameToOpcode['JMP'], 0, 9])
+
+
+def test_compile_macro_parameters() -> bool:
+    """Macro parameters replace whole identifiers only, so a parameter X leaves the X in LDX alone"""
+    compiler = AdvancedCompiler()
+    macros = "MACRO LOAD_X X\nLDX X\nENDMACRO\nMACRO BUMP X\nLOAD_X X\nINX\nENDMACRO\n"
+    return (compiler.compile_source(macros + "LOAD_X 7") == bytes([NameToOpcode['LDX'], 7]) and
+            compiler.compile_source(macros + "BUMP 9\nHLT") == bytes([NameToOpcode['LDX'], 9, NameToOpcode['INX'], NameToOpcode['HLT']]))
+
+
+def test_compile_missing_operand() -> bool:
+    """A superinstruction missing one of its operands is rejected rather than padded with zeros"""
+    try:
+        AdvancedCompiler().compile_source("LWA 42")
+    except CompilerError as e:
+        return "expects 2 parameters, got 1" in e.message
+    return False
+
+
+def test_compile_hex_limits() -> bool:
+    """Hex literals take 1-4 digits, anything else is rejected before it reaches an operand"""
+    compiler = AdvancedCompiler()
+    for source in ("LDA $", "WMA $12345"):
+        try:
+            compiler.compile_source(source)
+        except CompilerError as e:
+            if "Hex value must have 1-4 digits" not in e.message:
+                return False
+        else:
+            return False
+    return compiler.compile_source("LDA $F\nWMA $FFFF") == bytes([NameToOpcode['LDA'], 0x0F, NameToOpcode['WMA'], 0xFF, 0xFF])
+
+
+def test_decompile_invalid_byte() -> bool:
+    """The decompiler rejects list values that are not bytes with an error naming the value"""
+    sys.path.insert(0, os.path.join(current_dir, '..', '..', 'scripts'))
+    from decompile import CPUDecompiler
+    decompiler = CPUDecompiler()
+    try:
+        decompiler.decompile([NameToOpcode['LDA'], 300])
+    except ValueError as e:
+        last_line = decompiler.decompile([NameToOpcode['LDA'], 255], include_comments=False).splitlines()[-1]
+        return "position 1: 300" in str(e) and last_line.strip() == "LDA 255"
+    return False
+
+
 def main():
     """Test all available CPU instructions with corrected expectations"""
     print("Comprehensive CPU Instruction Test Suite")
     print("=" * 50)
     
     # Import all instruction modules
-    from python_cpu_emulator.instructions import arithmetic, bitwise, comparison, control, load_store, memory
+    from python_cpu_emulator.instructions import arithmetic, bitwise, comparison, control, load_store, memory, superinstructions
     
     passed = 0
     failed = 0
@@ -519,6 +666,33 @@ def main():
     run_test("JBA", lambda: test_instruction(control.JBA, {'A': 20, 'PC': 100}, {'PC': 81, 'A': 20}, ignore_pc=False))
     run_test("JBX", lambda: test_instruction(control.JBX, {'X': 30, 'PC': 500}, {'PC': 471, 'X': 30}, ignore_pc=False))
     run_test("JBY", lambda: test_instruction(control.JBY, {'Y': 10, 'PC': 1000}, {'PC': 991, 'Y': 10}, ignore_pc=False))
+    run_test("Unassigned opcode", test_unassigned_opcode)
+    run_test("Specialized kernel", test_specialized_kernel)
+    run_test("Block kernel", test_block_kernel)
+    
+    # Superinstructions
+    print("\n--- Superinstructions ---")
+    run_test("LWX", lambda: test_instruction(superinstructions.LWX, {'X': 50, 'Y': 1, 'data': [72]}, {'A': 72, 'X': 51, 'ram': {306: 72}}))
+    run_test("IJX", lambda: test_instruction(superinstructions.IJX, {'X': 10, 'data': address_to_bytes(512)}, {'X': 11, 'PC': 512}, ignore_pc=False))
+    run_test("IJX overflow", lambda: test_instruction(superinstructions.IJX, {'X': 255, 'data': address_to_bytes(512)}, {'X': 0, 'PC': 3}, ignore_pc=False))
+    run_test("CYR", lambda: test_instruction(superinstructions.CYR, {'A': 9, 'ram': {100: 55}, 'data': address_to_bytes(100)}, {'A': 55, 'Y': 9}))
+    run_test("RAX zero", lambda: test_instruction(superinstructions.RAX, {'A': 9, 'data': address_to_bytes(200)}, {'A': 0, 'X': 0, 'Z': True}))
+    run_test("XWA", lambda: test_instruction(superinstructions.XWA, {'X': 99, 'data': address_to_bytes(512)}, {'A': 99, 'ram': {512: 99}}))
+    run_test("YWA", lambda: test_instruction(superinstructions.YWA, {'Y': 77, 'data': address_to_bytes(768)}, {'A': 77, 'ram': {768: 77}}))
+    run_test("LWA", lambda: test_instruction(superinstructions.LWA, {'data': [42, *address_to_bytes(600)]}, {'A': 42, 'ram': {600: 42}}))
+    run_test("IZA", lambda: test_instruction(superinstructions.IZA, {'A': 10, 'data': address_to_bytes(512)}, {'A': 11, 'PC': 512}, ignore_pc=False))
+    run_test("IZA zero", lambda: test_instruction(superinstructions.IZA, {'A': 255, 'data': address_to_bytes(512)}, {'A': 0, 'PC': 3}, ignore_pc=False))
+    run_test("IJA overflow", lambda: test_instruction(superinstructions.IJA, {'A': 255, 'data': address_to_bytes(512)}, {'A': 0, 'PC': 3}, ignore_pc=False))
+    run_test("IJY", lambda: test_instruction(superinstructions.IJY, {'Y': 4, 'data': address_to_bytes(512)}, {'Y': 5, 'PC': 512}, ignore_pc=False))
+    run_test("LSA", lambda: test_instruction(superinstructions.LSA, {'A': 32, 'data': [32]}, {'A': 0, 'X': 32, 'Z': True}))
+    run_test("CLL", lambda: test_instruction(superinstructions.CLL, {'A': 1, 'X': 2, 'Y': 3, 'data': [7, 8]}, {'A': 7, 'X': 8, 'Y': 0}))
+    run_test("Compile superinstructions", test_compile_superinstructions)
+    run_test("Compile label addresses", test_compile_label_addresses)
+    run_test("Compile optimize", test_compile_optimize)
+    run_test("Compile macro parameters", test_compile_macro_parameters)
+    run_test("Compile missing operand", test_compile_missing_operand)
+    run_test("Compile hex limits", test_compile_hex_limits)
+    run_test("Decompile invalid byte", test_decompile_invalid_byte)
     
     print(f"\n--- Test Results ---")
     print(f"Passed: {passed}")
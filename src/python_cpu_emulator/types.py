@@ -1,3 +1,6 @@
-type Flags = dict[str, bool]     # flags dictionary
-type Registers = dict[str, int]  # registers dictionary
-type Data = list[int]            # data type for any kind of RAM data
\ No newline at end of file
+type Flags = int                 # flags bitmask, bit values are defined in utils
+type Registers = list[int]       # register file, indexed by A, X, Y and PC from utils
+type Data = list[int]            # data type for any kind of RAM data
+type Memory = bytearray          # packed RAM storage, one byte per address
+type Operands = tuple[int, ...]  # operand bytes that follow an opcode
+type Program = bytes             # compiled machine code, one byte per address
\ No newline at end of file
@@ -1,12 +1,18 @@
 from .types import Flags, Registers, Data
 
 
-HALT_FLAGS:      Flags = {'Z': False, 'O': False, 'H': True,  'N': False}
-BLANK_FLAGS:     Flags = {'Z': False, 'O': False, 'H': False, 'N': False}
-ZERO_FLAGS:      Flags = {'Z': True,  'O': False, 'H': False, 'N': False}
-OVERFLOW_FLAGS:  Flags = {'Z': False, 'O': True,  'H': False, 'N': False}
-NEGATIVE_FLAGS:  Flags = {'Z': False, 'O': False, 'H': False, 'N': True }
-OVER_ZERO_FLAGS: Flags = {'Z': True,  'O': True,  'H': False, 'N': False}
+# Register file indices
+A, X, Y, PC = 0, 1, 2, 3
+REGISTER_NAMES = ('A', 'X', 'Y', 'PC')
+
+# Status flags are packed into a single int, one bit per flag
+BLANK_FLAGS:     Flags = 0b0000
+ZERO_FLAGS:      Flags = 0b0001
+OVERFLOW_FLAGS:  Flags = 0b0010
+HALT_FLAGS:      Flags = 0b0100
+NEGATIVE_FLAGS:  Flags = 0b1000
+OVER_ZERO_FLAGS: Flags = ZERO_FLAGS | OVERFLOW_FLAGS
+FLAG_BITS: dict[str, Flags] = {'Z': ZERO_FLAGS, 'O': OVERFLOW_FLAGS, 'H': HALT_FLAGS, 'N': NEGATIVE_FLAGS}
 
 
 def build_readme() -> str:
@@ -15,7 +21,7 @@ def build_readme() -> str:
     from .instructions import InstructionSet
     output = "| Name | Opcode | Length | Description | Flags |"
     for instr in (sorted(InstructionSet.values(), key=operator.attrgetter('opcode'))):
-        output += f"\n| {str(instr)[21:-2]} | {instr.opcode} | {instr.length} | {instr.__doc__.strip()} | None |" # type: ignore
+        output += f"\n| {instr.__name__} | {instr.opcode} | {instr.length} | {instr.__doc__.strip()} | None |" # type: ignore
     return output
 
 
@@ -24,13 +30,18 @@ def data_to_memory_location(data: Data) -> int:
     return (data[0] << 8) + data[1]
 
 
-def blank_flags() -> Flags:
-    """Returns a blank flag dictionary"""
-    return BLANK_FLAGS
+def registers_to_dict(reg: Registers) -> dict[str, int]:
+    """Returns the register file as a name -> value dictionary"""
+    return dict(zip(REGISTER_NAMES, reg))
+
+
+def flags_to_dict(flags: Flags) -> dict[str, bool]:
+    """Returns the flags bitmask as a name -> bool dictionary"""
+    return {name: bool(flags & bit) for name, bit in FLAG_BITS.items()}
 
 
 def set_flags(value: int) -> Flags:
-    """Returns a dict of flags set by the integer value supplied"""
+    """Returns the flags set by the integer value supplied"""
     if value < 0:
         return NEGATIVE_FLAGS
     elif value == 0: